@@ -135,8 +135,7 @@ async def upload_recording(
 
     db.add(recording)
 
-    # Update project stats
-    project.recording_count += 1
+    # Update project stats (recording_count is maintained by the Recording insert hook)
     project.updated_at = datetime.utcnow()
 
     await db.commit()
@@ -171,7 +170,7 @@ async def list_recordings(
 ):
     """List recordings for a project."""
     # Verify project access
-    await verify_project_access(db, project_id, current_user.id)
+    project = await verify_project_access(db, project_id, current_user.id)
 
     query = select(Recording).where(Recording.project_id == project_id)
 
@@ -183,10 +182,13 @@ async def list_recordings(
         except ValueError:
             raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
 
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
+    # Get total count (unfiltered lists use the denormalized project counter)
+    if status:
+        count_query = select(func.count()).select_from(query.subquery())
+        total_result = await db.execute(count_query)
+        total = total_result.scalar()
+    else:
+        total = project.recording_count
 
     # Apply pagination
     query = query.order_by(Recording.created_at.desc())
@@ -329,8 +331,7 @@ async def delete_recording(
     if os.path.exists(recording.storage_path):
         os.remove(recording.storage_path)
 
-    # Update project stats
-    project.recording_count = max(0, project.recording_count - 1)
+    # Update project stats (recording_count is maintained by the Recording delete hook)
     project.total_duration = max(0, project.total_duration - recording.duration)
     project.updated_at = datetime.utcnow()
 
@@ -623,7 +624,9 @@ async def get_transcript(
         select(Recording)
         .options(
             selectinload(Recording.project),
-            selectinload(Recording.transcript).selectinload(Transcript.segments),
+            selectinload(Recording.transcript)
+            .selectinload(Transcript.segments)
+            .undefer(TranscriptSegment.words_json),
         )
         .where(Recording.id == recording_id)
     )
@@ -646,7 +649,8 @@ async def get_transcript(
     speaker_ids = set()
     speaker_names = {}
 
-    for seg in sorted(transcript.segments, key=lambda s: s.segment_index):
+    # Segments are loaded in segment_index order by the relationship
+    for seg in transcript.segments:
         speaker_id = seg.speaker_id or "speaker_0"
         speaker_ids.add(speaker_id)
         if seg.speaker_name:
@@ -7,7 +7,7 @@ from typing import List, Optional
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, undefer
 import os
 import io
 import json
@@ -126,7 +126,10 @@ async def get_segment(
     """Get a single transcript segment."""
     result = await db.execute(
         select(TranscriptSegment)
-        .options(selectinload(TranscriptSegment.transcript).selectinload(Transcript.recording).selectinload(Recording.project))
+        .options(
+            undefer(TranscriptSegment.words_json),
+            selectinload(TranscriptSegment.transcript).selectinload(Transcript.recording).selectinload(Recording.project),
+        )
         .where(TranscriptSegment.id == segment_id, TranscriptSegment.transcript_id == transcript_id)
     )
     segment = result.scalar_one_or_none()
@@ -172,7 +175,10 @@ async def update_segment(
     """Update transcript segment text."""
     result = await db.execute(
         select(TranscriptSegment)
-        .options(selectinload(TranscriptSegment.transcript).selectinload(Transcript.recording).selectinload(Recording.project))
+        .options(
+            undefer(TranscriptSegment.words_json),
+            selectinload(TranscriptSegment.transcript).selectinload(Transcript.recording).selectinload(Recording.project),
+        )
         .where(TranscriptSegment.id == segment_id, TranscriptSegment.transcript_id == transcript_id)
     )
     segment = result.scalar_one_or_none()
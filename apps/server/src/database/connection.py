@@ -11,11 +11,22 @@ class Base(DeclarativeBase):
     pass
 
 
+# Pool tuning only applies to networked databases; SQLite has no connection handshake
+engine_options: dict = {"pool_pre_ping": True}
+if not settings.database_url.startswith("sqlite"):
+    engine_options.update(
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+    )
+
 # Create async engine
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
     future=True,
+    **engine_options,
 )
 
 # Session factory
@@ -37,8 +48,6 @@ async def get_db():
         except Exception:
             await session.rollback()
             raise
-        finally:
-            await session.close()
 
 
 async def init_db():
@@ -2,12 +2,17 @@
 
 from datetime import datetime
 from typing import Optional, List
-from sqlalchemy import String, Text, Integer, Float, Boolean, DateTime, ForeignKey, JSON, Enum as SQLEnum
+from sqlalchemy import String, Text, Integer, Float, Boolean, DateTime, ForeignKey, Index, JSON, Enum as SQLEnum
+from sqlalchemy import event, update
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 import enum
 
 from src.database.connection import Base
 
+# Binary JSONB on PostgreSQL (parsed once on write, indexable); plain JSON elsewhere
+MetadataJSON = JSON().with_variant(JSONB(), "postgresql")
+
 
 class UserRole(str, enum.Enum):
     """User role enumeration."""
@@ -52,6 +57,15 @@ class User(Base):
 class Project(Base):
     """Project model."""
     __tablename__ = "projects"
+    __table_args__ = (
+        # list_projects: WHERE owner_id = ? ORDER BY updated_at DESC
+        Index(
+            "ix_projects_owner_updated",
+            "owner_id",
+            "updated_at",
+            postgresql_include=["name", "status", "recording_count"],
+        ),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -60,7 +74,7 @@ class Project(Base):
     status: Mapped[ProjectStatus] = mapped_column(SQLEnum(ProjectStatus), default=ProjectStatus.ACTIVE)
     recording_count: Mapped[int] = mapped_column(Integer, default=0)
     total_duration: Mapped[int] = mapped_column(Integer, default=0)  # milliseconds
-    metadata_json: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    metadata_json: Mapped[Optional[dict]] = mapped_column(MetadataJSON, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -72,6 +86,15 @@ class Project(Base):
 class Recording(Base):
     """Recording model."""
     __tablename__ = "recordings"
+    __table_args__ = (
+        # list_recordings: WHERE project_id = ? ORDER BY created_at DESC
+        Index(
+            "ix_recordings_project_created",
+            "project_id",
+            "created_at",
+            postgresql_include=["name", "duration", "transcription_status"],
+        ),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
     project_id: Mapped[str] = mapped_column(String(36), ForeignKey("projects.id"), nullable=False)
@@ -87,7 +110,7 @@ class Recording(Base):
         SQLEnum(TranscriptionStatus), default=TranscriptionStatus.PENDING
     )
     transcription_progress: Mapped[int] = mapped_column(Integer, default=0)
-    metadata_json: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    metadata_json: Mapped[Optional[dict]] = mapped_column(MetadataJSON, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -108,18 +131,27 @@ class Transcript(Base):
     word_count: Mapped[int] = mapped_column(Integer, default=0)
     speaker_count: Mapped[int] = mapped_column(Integer, default=0)
     confidence: Mapped[float] = mapped_column(Float, default=0.0)
-    metadata_json: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    metadata_json: Mapped[Optional[dict]] = mapped_column(MetadataJSON, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
     recording: Mapped["Recording"] = relationship("Recording", back_populates="transcript")
-    segments: Mapped[List["TranscriptSegment"]] = relationship("TranscriptSegment", back_populates="transcript", lazy="selectin")
+    segments: Mapped[List["TranscriptSegment"]] = relationship(
+        "TranscriptSegment",
+        back_populates="transcript",
+        lazy="selectin",
+        order_by="TranscriptSegment.segment_index",
+    )
 
 
 class TranscriptSegment(Base):
     """Transcript segment model."""
     __tablename__ = "transcript_segments"
+    __table_args__ = (
+        # Segments are always read per transcript in playback order
+        Index("ix_segments_transcript_order", "transcript_id", "segment_index"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
     transcript_id: Mapped[str] = mapped_column(String(36), ForeignKey("transcripts.id"), nullable=False)
@@ -130,10 +162,31 @@ class TranscriptSegment(Base):
     start_time: Mapped[float] = mapped_column(Float, nullable=False)  # seconds
     end_time: Mapped[float] = mapped_column(Float, nullable=False)  # seconds
     confidence: Mapped[float] = mapped_column(Float, default=0.0)
-    words_json: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)  # Word-level timestamps
-    inflection_json: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)  # Prosody/emotion data
+    # Large blobs are deferred; undefer them explicitly where word/prosody detail is returned
+    words_json: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True, deferred=True)  # Word-level timestamps
+    inflection_json: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True, deferred=True)  # Prosody/emotion data
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
     transcript: Mapped["Transcript"] = relationship("Transcript", back_populates="segments")
+
+
+# Denormalized counters, kept in sync at flush time so list endpoints never aggregate
+def _adjust_counter(connection, table, column: str, row_id: str, delta: int) -> None:
+    """Atomically add delta to a counter column on a single row."""
+    connection.execute(
+        update(table)
+        .where(table.c.id == row_id)
+        .values({column: table.c[column] + delta})
+    )
+
+
+@event.listens_for(Recording, "after_insert")
+def _recording_inserted(mapper, connection, target: Recording) -> None:
+    _adjust_counter(connection, Project.__table__, "recording_count", target.project_id, 1)
+
+
+@event.listens_for(Recording, "after_delete")
+def _recording_deleted(mapper, connection, target: Recording) -> None:
+    _adjust_counter(connection, Project.__table__, "recording_count", target.project_id, -1)
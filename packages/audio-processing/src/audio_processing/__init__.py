@@ -6,7 +6,9 @@ from audio_processing.quality import AudioQuality, analyze_quality
 from audio_processing.formats import (
     SUPPORTED_AUDIO_FORMATS,
     SUPPORTED_VIDEO_FORMATS,
+    clear_audio_info_cache,
     get_audio_info,
+    get_audio_info_many,
     is_supported_format,
 )
 
@@ -17,6 +19,8 @@ __all__ = [
     "analyze_quality",
     "SUPPORTED_AUDIO_FORMATS",
     "SUPPORTED_VIDEO_FORMATS",
+    "clear_audio_info_cache",
     "get_audio_info",
+    "get_audio_info_many",
     "is_supported_format",
 ]
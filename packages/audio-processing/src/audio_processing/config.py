@@ -24,6 +24,9 @@ class AudioConfig:
     # Noise reduction
     noise_reduce_enabled: bool = False
     noise_reduce_strength: float = 1.0
+    noise_reduce_block_seconds: float = 60.0  # Blocks are denoised in parallel
+    noise_reduce_overlap_seconds: float = 1.0  # Cross-fade between blocks
+    noise_reduce_workers: int | None = None  # None = half the CPU count
 
     # FFmpeg settings
     ffmpeg_path: str | None = None
@@ -5,7 +5,10 @@ import os
 import subprocess
 import tempfile
 import uuid
+import weakref
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from itertools import repeat
 from pathlib import Path
 
 import numpy as np
@@ -19,12 +22,12 @@ from audio_processing.formats import (
     is_supported_format,
     is_video_format,
 )
-from audio_processing.quality import AudioQuality, analyze_quality
+from audio_processing.quality import AudioQuality, analyze_quality, mix_to_mono
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class AudioChunk:
     """A chunk of audio data."""
 
@@ -35,27 +38,78 @@ class AudioChunk:
     duration_seconds: float
 
 
+def _reduce_noise_block(audio: np.ndarray, sample_rate: int, prop_decrease: float) -> np.ndarray:
+    """Run stationary noise reduction on one block (module-level so it can be pickled)."""
+    import noisereduce as nr
+
+    return nr.reduce_noise(
+        y=audio,
+        sr=sample_rate,
+        prop_decrease=prop_decrease,
+        stationary=True,
+    )
+
+
+def _crossfade_blocks(
+    blocks: list[np.ndarray],
+    starts: list[int],
+    overlap: int,
+    total_length: int,
+) -> np.ndarray:
+    """Stitch overlapping blocks back together with a linear cross-fade."""
+    output = np.zeros((total_length, *blocks[0].shape[1:]), dtype=blocks[0].dtype)
+    fade_in = np.linspace(0.0, 1.0, overlap, dtype=output.dtype)
+    fade_in = fade_in.reshape(-1, *([1] * (output.ndim - 1)))
+
+    for i, (start, block) in enumerate(zip(starts, blocks)):
+        if i == 0 or overlap == 0:
+            output[start:start + len(block)] = block
+            continue
+        end_fade = start + overlap
+        output[start:end_fade] = output[start:end_fade] * (1.0 - fade_in) + block[:overlap] * fade_in
+        output[end_fade:start + len(block)] = block[overlap:]
+
+    return output
+
+
+def _cleanup_paths(paths: list[Path]) -> None:
+    """Remove temporary files and empty the list in place."""
+    for path in paths:
+        try:
+            if path.exists():
+                path.unlink()
+        except Exception as e:
+            logger.warning(f"Failed to delete temp file {path}: {e}")
+    paths.clear()
+
+
 class AudioProcessor:
-    """Audio processing pipeline."""
+    """Audio processing pipeline.
+
+    Use as a context manager so temporary files are removed as soon as the
+    block exits; abandoned instances are still cleaned up when collected or
+    at interpreter exit.
+    """
 
     def __init__(self, config: AudioConfig | None = None):
         self.config = config or AudioConfig()
         self._temp_files: list[Path] = []
+        self._finalizer = (
+            weakref.finalize(self, _cleanup_paths, self._temp_files)
+            if self.config.cleanup_temp_files
+            else None
+        )
+
+    def __enter__(self) -> "AudioProcessor":
+        return self
 
-    def __del__(self):
-        """Clean up temporary files."""
+    def __exit__(self, *exc_info: object) -> None:
         if self.config.cleanup_temp_files:
             self._cleanup_temp_files()
 
     def _cleanup_temp_files(self) -> None:
         """Remove temporary files."""
-        for path in self._temp_files:
-            try:
-                if path.exists():
-                    path.unlink()
-            except Exception as e:
-                logger.warning(f"Failed to delete temp file {path}: {e}")
-        self._temp_files.clear()
+        _cleanup_paths(self._temp_files)
 
     def _get_temp_path(self, suffix: str = ".wav") -> Path:
         """Get a temporary file path."""
@@ -169,20 +223,25 @@ class AudioProcessor:
         audio, sample_rate = sf.read(str(input_path), dtype="float32")
 
         # Ensure mono
-        if audio.ndim > 1:
-            audio = np.mean(audio, axis=1)
+        audio = mix_to_mono(audio)
 
         total_duration = len(audio) / sample_rate
         chunk_samples = int(chunk_duration * sample_rate)
         overlap_samples = int(overlap * sample_rate)
         step_samples = chunk_samples - overlap_samples
 
-        chunks: list[AudioChunk] = []
-        position = 0
-        index = 0
+        # Number of windows needed for the last one to reach the end of the audio
+        total_samples = len(audio)
+        if total_samples == 0:
+            n_chunks = 0
+        else:
+            n_chunks = 1 + max(0, -(-(total_samples - chunk_samples) // step_samples))
+
+        chunks: list[AudioChunk] = [None] * n_chunks  # type: ignore[list-item]
 
-        while position < len(audio):
-            end_position = min(position + chunk_samples, len(audio))
+        for index in range(n_chunks):
+            position = index * step_samples
+            end_position = min(position + chunk_samples, total_samples)
             chunk_audio = audio[position:end_position]
 
             # Save chunk to temp file
@@ -192,20 +251,13 @@ class AudioProcessor:
             start_seconds = position / sample_rate
             end_seconds = end_position / sample_rate
 
-            chunks.append(AudioChunk(
+            chunks[index] = AudioChunk(
                 index=index,
                 start_seconds=start_seconds,
                 end_seconds=end_seconds,
                 path=str(chunk_path),
                 duration_seconds=end_seconds - start_seconds,
-            ))
-
-            position += step_samples
-            index += 1
-
-            # Break if we've processed all audio
-            if end_position >= len(audio):
-                break
+            )
 
         logger.info(f"Split {input_path.name} into {len(chunks)} chunks")
         return chunks
@@ -248,8 +300,6 @@ class AudioProcessor:
         Returns:
             Path to processed audio file
         """
-        import noisereduce as nr
-
         input_path = Path(input_path)
         if not input_path.exists():
             raise FileNotFoundError(f"File not found: {input_path}")
@@ -264,13 +314,30 @@ class AudioProcessor:
         # Load audio
         audio, sample_rate = sf.read(str(input_path), dtype="float32")
 
-        # Apply noise reduction
-        reduced = nr.reduce_noise(
-            y=audio,
-            sr=sample_rate,
-            prop_decrease=min(strength, 1.0),
-            stationary=True,
-        )
+        prop_decrease = min(strength, 1.0)
+        block_samples = int(self.config.noise_reduce_block_seconds * sample_rate)
+        overlap_samples = int(self.config.noise_reduce_overlap_seconds * sample_rate)
+
+        # Apply noise reduction, splitting long files into overlapping blocks
+        # that are denoised in parallel (STFT work is CPU-bound)
+        if len(audio) <= block_samples or overlap_samples >= block_samples:
+            reduced = _reduce_noise_block(audio, sample_rate, prop_decrease)
+        else:
+            step = block_samples - overlap_samples
+            starts = list(range(0, len(audio) - overlap_samples, step))
+            blocks = [audio[start:start + block_samples] for start in starts]
+            # Half the cores avoids oversubscribing the BLAS threads numpy spawns
+            workers = self.config.noise_reduce_workers or max(1, (os.cpu_count() or 2) // 2)
+
+            with ProcessPoolExecutor(max_workers=min(workers, len(blocks))) as executor:
+                reduced_blocks = list(executor.map(
+                    _reduce_noise_block,
+                    blocks,
+                    repeat(sample_rate),
+                    repeat(prop_decrease),
+                ))
+
+            reduced = _crossfade_blocks(reduced_blocks, starts, overlap_samples, len(audio))
 
         # Save
         sf.write(str(output_path), reduced, sample_rate)
@@ -278,6 +345,57 @@ class AudioProcessor:
         logger.info(f"Applied noise reduction to {input_path.name}")
         return output_path
 
+    def decode_to_ndarray(self, input_path: str | Path) -> tuple[np.ndarray, int]:
+        """Decode audio/video straight into memory in the target format.
+
+        FFmpeg writes raw PCM to stdout, skipping the intermediate WAV file
+        that normalize() would write and immediately read back.
+
+        Args:
+            input_path: Path to input audio/video file
+
+        Returns:
+            Tuple of (float32 audio array, sample rate)
+        """
+        input_path = Path(input_path)
+        if not input_path.exists():
+            raise FileNotFoundError(f"File not found: {input_path}")
+
+        if not is_supported_format(input_path):
+            raise ValueError(f"Unsupported format: {input_path.suffix}")
+
+        ffmpeg = self.config.ffmpeg_path or "ffmpeg"
+        sample_rate = self.config.target_sample_rate
+        channels = self.config.target_channels
+
+        cmd = [
+            ffmpeg,
+            "-i", str(input_path),
+            "-ar", str(sample_rate),
+            "-ac", str(channels),
+            "-f", "s16le",
+            "-acodec", "pcm_s16le",
+            "pipe:1",
+        ]
+
+        try:
+            result = subprocess.run(
+                cmd,
+                capture_output=True,
+                check=True,
+            )
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(f"FFmpeg decoding failed: {e.stderr.decode()}") from e
+        except FileNotFoundError:
+            raise RuntimeError("FFmpeg not found. Please install FFmpeg.")
+
+        audio = np.frombuffer(result.stdout, dtype=np.int16).astype(np.float32)
+        audio *= 1.0 / 32768.0
+        if channels > 1:
+            audio = audio.reshape(-1, channels)
+
+        return audio, sample_rate
+
     def load_audio(
         self,
         path: str | Path,
@@ -298,7 +416,7 @@ class AudioProcessor:
             is_video_format(path) or
             path.suffix.lower() not in {".wav"}
         ):
-            path = self.normalize(path)
+            return self.decode_to_ndarray(path)
 
         audio, sample_rate = sf.read(str(path), dtype="float32")
         return audio, sample_rate
@@ -1,5 +1,6 @@
 """Audio quality analysis utilities."""
 
+import math
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -7,7 +8,7 @@ import numpy as np
 import soundfile as sf
 
 
-@dataclass
+@dataclass(slots=True)
 class AudioQuality:
     """Audio quality analysis results."""
 
@@ -42,6 +43,20 @@ class AudioQuality:
     issues: list[str]
 
 
+def mix_to_mono(audio: np.ndarray) -> np.ndarray:
+    """Average a (frames, channels) array down to mono.
+
+    Sums straight into a single float32 output buffer; 1-D input is returned as-is.
+    """
+    if audio.ndim == 1:
+        return audio
+
+    mono = np.empty(audio.shape[0], dtype=np.float32)
+    np.add.reduce(audio, axis=1, out=mono)
+    mono *= 1.0 / audio.shape[1]
+    return mono
+
+
 def analyze_quality(
     path: str | Path,
     silence_threshold_db: float = -40.0,
@@ -61,38 +76,53 @@ def analyze_quality(
     if not path.exists():
         raise FileNotFoundError(f"File not found: {path}")
 
-    # Load audio
-    audio, sample_rate = sf.read(str(path), dtype="float32")
-
-    # Ensure 2D array
-    if audio.ndim == 1:
-        audio = audio.reshape(-1, 1)
-
-    channels = audio.shape[1]
-    duration = len(audio) / sample_rate
-
-    # Mix to mono for analysis
-    mono = np.mean(audio, axis=1)
-
-    # Calculate metrics
-    peak_amplitude = float(np.max(np.abs(mono)))
-    rms = float(np.sqrt(np.mean(mono ** 2)))
+    silence_threshold = 10 ** (silence_threshold_db / 20)
+    info = sf.info(str(path))
+
+    if info.subtype == "PCM_16" and info.channels == 1:
+        # Fast path for normalized 16-bit mono: analyze the raw int16 samples
+        # (half the bytes of float32) against integer thresholds. Magnitudes
+        # are viewed as uint16 so |-32768| does not wrap.
+        audio, sample_rate = sf.read(str(path), dtype="int16")
+        channels = 1
+        mono = audio
+        abs_mono = np.abs(audio).view(np.uint16)
+        scale = 1.0 / 32768.0
+        clip_level = math.ceil(clipping_threshold * 32768)
+        silence_level = math.ceil(silence_threshold * 32768)
+    else:
+        # Load audio
+        audio, sample_rate = sf.read(str(path), dtype="float32")
+        channels = 1 if audio.ndim == 1 else audio.shape[1]
+
+        # Mix to mono for analysis
+        mono = mix_to_mono(audio)
+        abs_mono = np.abs(mono)
+        scale = 1.0
+        clip_level = clipping_threshold
+        silence_level = silence_threshold
+
+    n = len(abs_mono)
+    duration = n / sample_rate
+
+    # Calculate metrics (sum of squares accumulates in float64 without a full copy)
+    peak_amplitude = float(abs_mono.max()) * scale
+    rms = float(np.sqrt(np.einsum("i,i->", mono, mono, dtype=np.float64) / n)) * scale
     rms_db = 20 * np.log10(rms + 1e-10)
 
     # Calculate clipping ratio
-    clipping_mask = np.abs(mono) >= clipping_threshold
-    clipping_ratio = float(np.sum(clipping_mask) / len(mono))
+    clipping_ratio = float(np.count_nonzero(abs_mono >= clip_level) / n)
 
     # Calculate silence ratio
-    silence_threshold = 10 ** (silence_threshold_db / 20)
-    silence_mask = np.abs(mono) < silence_threshold
-    silence_ratio = float(np.sum(silence_mask) / len(mono))
+    silence_ratio = float(np.count_nonzero(abs_mono < silence_level) / n)
 
     # Estimate SNR using a simple method
     # This is a rough estimate based on assuming noise is in quiet sections
-    sorted_amplitudes = np.sort(np.abs(mono))
-    noise_floor = np.mean(sorted_amplitudes[:len(sorted_amplitudes) // 10])  # Bottom 10%
-    signal_level = np.mean(sorted_amplitudes[-len(sorted_amplitudes) // 10:])  # Top 10%
+    # Partial partition (O(N)) is enough to split off the quietest/loudest deciles
+    k = max(1, n // 10)
+    partitioned = np.partition(abs_mono, (k - 1, n - k))
+    noise_floor = np.mean(partitioned[:k]) * scale  # Bottom 10%
+    signal_level = np.mean(partitioned[n - k:]) * scale  # Top 10%
 
     if noise_floor > 0:
         snr_db = float(20 * np.log10(signal_level / noise_floor))
@@ -0,0 +1,17 @@
+"""CPU capability detection for Verbatim Studio inference services."""
+
+from cpu_tuning.features import (
+    FP16_CPU_FLAGS,
+    INT8_CPU_FLAGS,
+    cpu_compute_type,
+    cpu_flags,
+    physical_cores,
+)
+
+__all__ = [
+    "FP16_CPU_FLAGS",
+    "INT8_CPU_FLAGS",
+    "cpu_compute_type",
+    "cpu_flags",
+    "physical_cores",
+]
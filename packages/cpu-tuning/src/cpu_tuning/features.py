@@ -0,0 +1,76 @@
+"""CPU feature detection for choosing CTranslate2 compute settings."""
+
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# CPU features with fast int8 dot products (x86 VNNI/AMX, ARM dotprod)
+INT8_CPU_FLAGS = ("amx_int8", "avx512_vnni", "avx_vnni", "asimddp")
+# ARMv8.2 native half-precision arithmetic
+FP16_CPU_FLAGS = ("asimdhp", "fphp")
+
+
+def cpu_flags() -> set[str] | None:
+    """Get the CPU feature flags from /proc/cpuinfo, or None where unavailable."""
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                # "flags" on x86, "Features" on ARM
+                key, _, value = line.partition(":")
+                if key.strip() in ("flags", "Features"):
+                    return set(value.split())
+    except OSError:
+        pass
+    return None
+
+
+def cpu_compute_type() -> str:
+    """Get the CPU compute type: int8 only where the CPU has int8 dot products.
+
+    Without VNNI/dotprod, CTranslate2's int8 GEMM falls back to slow generic
+    kernels and is often slower than float32. ARM cores with native fp16
+    arithmetic use float16 instead when CTranslate2 supports it there.
+    """
+    flags = cpu_flags()
+    if flags is None:
+        # No /proc/cpuinfo (e.g. macOS, where Apple Silicon has dotprod)
+        return "int8"
+
+    isa = next((flag for flag in INT8_CPU_FLAGS if flag in flags), None)
+    if isa is None:
+        fp16 = any(flag in flags for flag in FP16_CPU_FLAGS)
+        if fp16:
+            import ctranslate2
+
+            if "float16" in ctranslate2.get_supported_compute_types("cpu"):
+                logger.info("CPU supports fp16 arithmetic, using float16")
+                return "float16"
+
+        logger.info("CPU lacks int8 dot-product instructions, using float32")
+        return "float32"
+
+    logger.info(f"CPU supports {isa}, using int8")
+    return "int8"
+
+
+def physical_cores() -> int:
+    """Count physical CPU cores, falling back to half the logical CPUs.
+
+    Hyperthread siblings share a core's execution units, so one decoding
+    thread per physical core avoids oversubscribing them.
+    """
+    cores: set[tuple[str, str]] = set()
+    physical_id = ""
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                key = key.strip()
+                if key == "physical id":
+                    physical_id = value.strip()
+                elif key == "core id":
+                    cores.add((physical_id, value.strip()))
+    except OSError:
+        pass
+    return len(cores) or max(1, (os.cpu_count() or 2) // 2)
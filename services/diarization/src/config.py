@@ -11,6 +11,8 @@ class Settings(BaseSettings):
     debug: bool = False
     host: str = "0.0.0.0"
     port: int = 8003
+    # Each worker loads its own pipeline; keep to one per GPU
+    workers: int = 1
 
     # HuggingFace
     hf_token: str | None = None
@@ -22,10 +24,24 @@ class Settings(BaseSettings):
     # Diarization settings
     min_speakers: int | None = None
     max_speakers: int | None = None
+    # Batch sizes for the pyannote pipeline (defaults of 32 are VRAM-hostile)
+    segmentation_batch_size: int = 8
+    embedding_batch_size: int = 8
+    # Speaker embeddings average each speaker's top-k turns, ranked by
+    # duration * (1 + recency_weight * position_in_file)
+    top_k_turns: int = 5
+    recency_weight: float = 0.0
 
     # Storage
     upload_dir: str = "/app/uploads"
     embeddings_dir: str = "/app/embeddings"
+    # Reuse diarization/embedding results for byte-identical uploads
+    cache_results: bool = True
+    # Least recently used results are evicted past either bound
+    cache_max_bytes: int = 1024**3
+    cache_max_age_days: int = 30
+    # Seconds between eviction scans of the cache directory
+    cache_prune_interval: float = 300.0
 
     class Config:
         env_prefix = ""
@@ -2,8 +2,11 @@
 
 import logging
 import os
+import threading
 from pathlib import Path
+from typing import Any
 
+import numpy as np
 import torch
 
 from src.config import settings
@@ -11,6 +14,15 @@ from src.schemas import DiarizationResult, SpeakerSegment
 
 logger = logging.getLogger(__name__)
 
+# Pretrained pipeline loaded from the HuggingFace hub
+PIPELINE_MODEL = "pyannote/speaker-diarization-3.1"
+
+# Sample rate the pyannote segmentation/embedding models operate at
+PIPELINE_SAMPLE_RATE = 16000
+
+# Samples per pinned staging buffer for host-to-GPU copies (4 MiB of float32)
+H2D_CHUNK_SAMPLES = 1 << 20
+
 
 class DiarizationEngine:
     """PyAnnote Audio-based speaker diarization engine."""
@@ -20,6 +32,15 @@ class DiarizationEngine:
         self._device: str = self._detect_device()
         self._model_loaded = False
 
+        # Two fixed-size pinned staging buffers (with the events marking when
+        # their last copy finished) and a copy stream for host-to-GPU
+        # transfers; created on first use, guarded by a lock since requests
+        # run in threads
+        self._pin_bufs: list[torch.Tensor] = []
+        self._h2d_events: list["torch.cuda.Event | None"] = []
+        self._h2d_stream: "torch.cuda.Stream | None" = None
+        self._h2d_lock = threading.Lock()
+
         # Ensure directories exist
         os.makedirs(settings.model_cache_dir, exist_ok=True)
         os.makedirs(settings.upload_dir, exist_ok=True)
@@ -68,14 +89,16 @@ class DiarizationEngine:
             from pyannote.audio import Pipeline
 
             self._pipeline = Pipeline.from_pretrained(
-                "pyannote/speaker-diarization-3.1",
+                PIPELINE_MODEL,
                 use_auth_token=settings.hf_token,
                 cache_dir=settings.model_cache_dir,
             )
+            self._pipeline.segmentation_batch_size = settings.segmentation_batch_size
+            self._pipeline.embedding_batch_size = settings.embedding_batch_size
 
-            # Move to device
-            if self._device == "cuda":
-                self._pipeline.to(torch.device("cuda"))
+            # Move to device (MPS benefits from native FFT as well as CUDA)
+            if self._device in ("cuda", "mps"):
+                self._pipeline.to(torch.device(self._device))
 
             self._model_loaded = True
             logger.info("Diarization pipeline loaded successfully")
@@ -84,6 +107,101 @@ class DiarizationEngine:
             logger.error(f"Failed to load diarization pipeline: {e}")
             raise RuntimeError(f"Failed to load pipeline: {e}") from e
 
+    def warmup(self) -> None:
+        """Run a dummy second of audio through the pipeline.
+
+        Moves CUDA context creation, cuDNN autotuning and lazy kernel loading
+        out of the first real request.
+        """
+        if self._pipeline is None:
+            self.load_model()
+
+        if self._device == "cuda":
+            torch.backends.cudnn.benchmark = True
+            # Allow TF32 matmuls on Ampere and newer
+            torch.set_float32_matmul_precision("high")
+
+        try:
+            dummy = torch.zeros(1, PIPELINE_SAMPLE_RATE, device=self._device)
+            with torch.inference_mode():
+                self._pipeline({"waveform": dummy, "sample_rate": PIPELINE_SAMPLE_RATE})
+            logger.info("Diarization pipeline warmed up")
+        except Exception as e:
+            logger.warning(f"Pipeline warmup failed: {e}")
+
+    def _load_audio(self, audio_path: Path) -> dict[str, Any] | str:
+        """Decode audio once into the in-memory form the pipeline accepts.
+
+        Passing a waveform dict stops pyannote from re-opening and decoding the
+        file for every sliding-window chunk. Falls back to the file path if the
+        file cannot be decoded up front.
+        """
+        try:
+            from pyannote.audio import Audio
+
+            audio_io = Audio(mono="downmix", sample_rate=PIPELINE_SAMPLE_RATE)
+            waveform, sample_rate = audio_io(str(audio_path))
+
+            # Keep the waveform next to the model so resampling/feature
+            # extraction runs on the accelerator instead of one CPU core
+            if self._device == "cuda":
+                waveform = self._copy_to_cuda(waveform)
+            elif self._device == "mps":
+                waveform = waveform.to(self._device, non_blocking=True)
+
+            return {"waveform": waveform, "sample_rate": sample_rate}
+        except Exception as e:
+            logger.warning(f"In-memory decode of {audio_path.name} failed, passing path: {e}")
+            return str(audio_path)
+
+    def _copy_to_cuda(self, waveform: torch.Tensor) -> torch.Tensor:
+        """Copy a CPU waveform to the GPU through pinned memory.
+
+        Copies from pageable memory are staged by the driver and block the
+        calling thread. Here the waveform goes through two small pinned
+        buffers in turn, so filling one overlaps the DMA out of the other on
+        a dedicated stream, and pinned memory stays bounded however long the
+        audio is. Work queued afterwards on the current stream is ordered
+        after the copy without blocking the host.
+        """
+        src = waveform.reshape(-1)
+        n = src.numel()
+        gpu_waveform = torch.empty(n, dtype=torch.float32, device="cuda")
+
+        with self._h2d_lock:
+            if self._h2d_stream is None:
+                self._h2d_stream = torch.cuda.Stream()
+                self._pin_bufs = [
+                    torch.empty(H2D_CHUNK_SAMPLES, dtype=torch.float32, pin_memory=True)
+                    for _ in range(2)
+                ]
+                self._h2d_events = [None, None]
+
+            # The copy stream writes a tensor allocated on the current stream
+            self._h2d_stream.wait_stream(torch.cuda.current_stream())
+            gpu_waveform.record_stream(self._h2d_stream)
+
+            for chunk, start in enumerate(range(0, n, H2D_CHUNK_SAMPLES)):
+                end = min(start + H2D_CHUNK_SAMPLES, n)
+                slot = chunk % 2
+
+                # Only wait for this buffer's previous copy before refilling it
+                if self._h2d_events[slot] is not None:
+                    self._h2d_events[slot].synchronize()
+
+                staging = self._pin_bufs[slot][:end - start]
+                staging.copy_(src[start:end])
+                with torch.cuda.stream(self._h2d_stream):
+                    gpu_waveform[start:end].copy_(staging, non_blocking=True)
+                    event = torch.cuda.Event()
+                    event.record(self._h2d_stream)
+                self._h2d_events[slot] = event
+
+            # Order the pipeline's work after the copy without a host sync
+            torch.cuda.current_stream().wait_stream(self._h2d_stream)
+
+        return gpu_waveform.view(waveform.shape)
+
     def diarize(
         self,
         audio_path: str | Path,
@@ -107,31 +225,41 @@ class DiarizationEngine:
         if max_speakers is not None:
             diarization_params["max_speakers"] = max_speakers
 
-        diarization = self._pipeline(str(audio_path), **diarization_params)
+        audio = self._load_audio(audio_path)
+        with torch.inference_mode():
+            diarization = self._pipeline(audio, **diarization_params)
 
         # Convert to our schema
-        segments: list[SpeakerSegment] = []
-        speakers_set: set[str] = set()
-        max_end = 0.0
-
+        starts: list[float] = []
+        ends: list[float] = []
+        labels: list[str] = []
         for turn, _, speaker in diarization.itertracks(yield_label=True):
-            segment = SpeakerSegment(
-                speaker=speaker,
-                start=turn.start,
-                end=turn.end,
+            starts.append(turn.start)
+            ends.append(turn.end)
+            labels.append(speaker)
+
+        # Sort by start time; pyannote's values are already valid, so skip
+        # per-segment validation
+        start_arr = np.asarray(starts, dtype=np.float64)
+        order = np.argsort(start_arr, kind="stable")
+        segments = [
+            SpeakerSegment.model_construct(
+                speaker=labels[i],
+                start=starts[i],
+                end=ends[i],
+                confidence=1.0,
             )
-            segments.append(segment)
-            speakers_set.add(speaker)
-            max_end = max(max_end, turn.end)
-
-        # Sort by start time
-        segments.sort(key=lambda s: s.start)
+            for i in order.tolist()
+        ]
+        # pyannote emits labels as SPEAKER_00, SPEAKER_01, ...; sorting the
+        # handful of unique labels keeps the response order stable
+        speakers = sorted(dict.fromkeys(labels))
 
         return DiarizationResult(
-            num_speakers=len(speakers_set),
+            num_speakers=len(speakers),
             segments=segments,
-            duration=max_end,
-            speakers=sorted(list(speakers_set)),
+            duration=float(np.max(ends)) if ends else 0.0,
+            speakers=speakers,
         )
 
     def get_embeddings(
@@ -149,37 +277,121 @@ class DiarizationEngine:
         logger.info(f"Extracting embeddings from {audio_path.name}")
 
         # First diarize to get speaker segments
-        diarization = self._pipeline(str(audio_path))
-
-        # Extract embeddings for each speaker
-        embeddings: dict[str, list[float]] = {}
+        audio = self._load_audio(audio_path)
+        with torch.inference_mode():
+            diarization = self._pipeline(audio)
 
         # Get the embedding model from the pipeline
-        if hasattr(self._pipeline, "embedding"):
-            embedding_model = self._pipeline.embedding
-
-            for turn, _, speaker in diarization.itertracks(yield_label=True):
-                if speaker not in embeddings:
-                    # Extract embedding for this speaker's segment
-                    try:
-                        import torchaudio
+        embedding_model = getattr(self._pipeline, "_embedding", None)
+        if not callable(embedding_model):
+            logger.warning("Pipeline does not expose an embedding model")
+            return {}
 
-                        waveform, sample_rate = torchaudio.load(
-                            str(audio_path),
-                            frame_offset=int(turn.start * sample_rate),
-                            num_frames=int((turn.end - turn.start) * sample_rate),
-                        )
-
-                        # Get embedding
-                        with torch.no_grad():
-                            emb = embedding_model(waveform.to(self._device))
-                            embeddings[speaker] = emb.cpu().numpy().tolist()[0]
+        if isinstance(audio, dict):
+            waveform, sample_rate = audio["waveform"], audio["sample_rate"]
+        else:
+            import torchaudio
+
+            waveform, sample_rate = torchaudio.load(audio)
+            waveform = waveform.mean(dim=0, keepdim=True)
+            if sample_rate != PIPELINE_SAMPLE_RATE:
+                waveform = torchaudio.functional.resample(waveform, sample_rate, PIPELINE_SAMPLE_RATE)
+                sample_rate = PIPELINE_SAMPLE_RATE
+
+        turns = [
+            (speaker, int(turn.start * sample_rate), int(turn.end * sample_rate))
+            for turn, _, speaker in diarization.itertracks(yield_label=True)
+        ]
+        turns = [(speaker, start, end) for speaker, start, end in turns if end > start]
+        turns = self._select_turns(turns)
+
+        # Embed the selected turns, then average per speaker
+        per_speaker: dict[str, list[np.ndarray]] = {}
+        for speaker, emb in self._embed_turns(embedding_model, waveform, turns):
+            per_speaker.setdefault(speaker, []).append(emb)
 
-                    except Exception as e:
-                        logger.warning(f"Failed to extract embedding for {speaker}: {e}")
+        embeddings: dict[str, list[float]] = {}
+        for speaker, rows in per_speaker.items():
+            stacked = np.stack(rows)
+            valid = stacked[~np.isnan(stacked).any(axis=1)]
+            if len(valid) == 0:
+                logger.warning(f"No usable embedding for {speaker}")
+                continue
+            embeddings[speaker] = valid.mean(axis=0).tolist()
 
         return embeddings
 
+    def _select_turns(
+        self,
+        turns: list[tuple[str, int, int]],
+    ) -> list[tuple[str, int, int]]:
+        """Keep each speaker's top-k turns, favouring long (and optionally late) ones.
+
+        Short turns are mostly backchannels and overlap noise, so a few long
+        turns give a cleaner speaker embedding than all of them.
+        """
+        by_speaker: dict[str, list[tuple[float, tuple[str, int, int]]]] = {}
+        n = len(turns)
+        for idx, turn in enumerate(turns):
+            _, start, end = turn
+            score = (end - start) * (1.0 + settings.recency_weight * idx / n)
+            by_speaker.setdefault(turn[0], []).append((score, turn))
+
+        selected: list[tuple[str, int, int]] = []
+        for scored in by_speaker.values():
+            scored.sort(key=lambda item: item[0], reverse=True)
+            selected.extend(turn for _, turn in scored[:settings.top_k_turns])
+
+        return selected
+
+    def _embed_turns(
+        self,
+        embedding_model: Any,
+        waveform: torch.Tensor,
+        turns: list[tuple[str, int, int]],
+    ) -> list[tuple[str, np.ndarray]]:
+        """Embed (speaker, start_sample, end_sample) turns in padded batches.
+
+        Turns are sorted by length so each batch pads as little as possible;
+        masks keep the padding out of the statistics pooling.
+        """
+        results: list[tuple[str, np.ndarray]] = []
+        turns = sorted(turns, key=lambda t: t[2] - t[1])
+        batch_size = settings.embedding_batch_size
+
+        for i in range(0, len(turns), batch_size):
+            batch = turns[i:i + batch_size]
+            max_len = max(end - start for _, start, end in batch)
+
+            waveforms = waveform.new_zeros((len(batch), 1, max_len))
+            masks = waveform.new_zeros((len(batch), max_len))
+            for j, (_, start, end) in enumerate(batch):
+                waveforms[j, :, :end - start] = waveform[:, start:end]
+                masks[j, :end - start] = 1.0
+
+            try:
+                # fp16 autocast on CUDA routes the frame extractor through
+                # tensor cores; reductions stay fp32
+                with torch.inference_mode(), torch.autocast(
+                    device_type="cuda",
+                    dtype=torch.float16,
+                    enabled=self._device == "cuda",
+                ):
+                    embs = embedding_model(
+                        waveforms.to(self._device, non_blocking=True),
+                        masks=masks.to(self._device, non_blocking=True),
+                    )
+            except Exception as e:
+                logger.warning(f"Failed to extract embeddings for {len(batch)} turns: {e}")
+                continue
+
+            if isinstance(embs, torch.Tensor):
+                embs = embs.float().cpu().numpy()
+            for (speaker, _, _), emb in zip(batch, np.asarray(embs, dtype=np.float32)):
+                results.append((speaker, emb))
+
+        return results
+
 
 # Global engine instance
 engine = DiarizationEngine()
@@ -1,17 +1,24 @@
 """Speaker diarization service."""
 
+import asyncio
+import hashlib
+import io
 import logging
 import os
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from pathlib import Path
 
 import aiofiles
+import numpy as np
 from fastapi import FastAPI, File, Form, HTTPException, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.config import settings
-from src.diarizer import engine
+from src.diarizer import PIPELINE_MODEL, engine
+from src.profiles import profile_store
 from src.schemas import (
     DiarizationRequest,
     DiarizationResult,
@@ -27,8 +34,111 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# In-memory speaker profiles (would be DB in production)
-speaker_profiles: dict[str, SpeakerProfile] = {}
+# All model work runs on one dedicated thread: requests queue up in FIFO
+# order instead of contending for the same GPU pipeline (and its VRAM)
+engine_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="engine")
+
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Monotonic time of this process's last cache eviction scan
+_last_prune = 0.0
+
+
+async def _save_upload(file: UploadFile, upload_path: Path) -> str:
+    """Stream an upload to disk in chunks, returning the SHA-256 of its bytes."""
+    digest = hashlib.sha256()
+    async with aiofiles.open(upload_path, "wb") as f:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            digest.update(chunk)
+            await f.write(chunk)
+    return digest.hexdigest()
+
+
+def _cache_path(content_hash: str, *params: object, suffix: str) -> Path | None:
+    """Get the cache path for an upload, or None when caching is disabled.
+
+    The key covers the upload's bytes, the request parameters and every
+    setting that shapes the result, so changing any of them misses.
+    """
+    if not settings.cache_results:
+        return None
+    fingerprint = repr(
+        (content_hash, params, PIPELINE_MODEL, settings.top_k_turns, settings.recency_weight)
+    )
+    name = hashlib.sha256(fingerprint.encode()).hexdigest()
+    return Path(settings.embeddings_dir) / "cache" / f"{name}{suffix}"
+
+
+def _read_cache(path: Path | None) -> bytes | None:
+    """Read a cached result, marking it recently used; None on a miss."""
+    if path is None:
+        return None
+    try:
+        data = path.read_bytes()
+        os.utime(path)
+        return data
+    except OSError:
+        return None
+
+
+def _write_cache(path: Path | None, data: bytes) -> None:
+    """Store a result atomically, evicting past the cache bounds now and then.
+
+    Eviction scans the whole directory, so it runs at most once per
+    cache_prune_interval rather than on every store. The result has already
+    been computed, so failures are only logged.
+    """
+    global _last_prune
+    if path is None:
+        return
+    tmp_path = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+        now = time.monotonic()
+        if now - _last_prune >= settings.cache_prune_interval:
+            _last_prune = now
+            _prune_cache(path.parent)
+    except OSError as e:
+        logger.warning(f"Failed to cache result: {e}")
+        tmp_path.unlink(missing_ok=True)
+
+
+def _prune_cache(cache_dir: Path) -> None:
+    """Delete expired results, then the least recently used past the size bound."""
+    entries = []
+    for path in cache_dir.iterdir():
+        if path.suffix in (".json", ".npz"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # Evicted by another worker
+            entries.append((stat.st_mtime, stat.st_size, path))
+    entries.sort()
+
+    cutoff = time.time() - settings.cache_max_age_days * 86400
+    total = sum(size for _, size, _ in entries)
+    for mtime, size, path in entries:
+        if mtime >= cutoff and total <= settings.cache_max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+
+
+def _dump_embeddings(embeddings: dict[str, list[float]]) -> bytes:
+    """Serialize embeddings for the cache."""
+    buffer = io.BytesIO()
+    np.savez_compressed(
+        buffer, **{speaker: np.asarray(emb) for speaker, emb in embeddings.items()}
+    )
+    return buffer.getvalue()
+
+
+def _load_embeddings(data: bytes) -> dict[str, list[float]]:
+    """Deserialize embeddings written by _dump_embeddings."""
+    with np.load(io.BytesIO(data)) as arrays:
+        return {speaker: arrays[speaker].tolist() for speaker in arrays.files}
 
 
 @asynccontextmanager
@@ -43,10 +153,12 @@ async def lifespan(app: FastAPI):
     else:
         logger.warning("No HuggingFace token - diarization will fail")
 
-    # Optionally preload model
-    if os.environ.get("PRELOAD_MODEL", "").lower() == "true":
+    # Preload and warm up the model (always on CUDA, where the first
+    # request would otherwise pay for context creation and autotuning)
+    if engine.device == "cuda" or os.environ.get("PRELOAD_MODEL", "").lower() == "true":
         try:
             engine.load_model()
+            engine.warmup()
         except Exception as e:
             logger.warning(f"Failed to preload model: {e}")
 
@@ -54,6 +166,7 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down...")
+    engine_executor.shutdown(wait=False, cancel_futures=True)
 
 
 app = FastAPI(
@@ -105,23 +218,34 @@ async def diarize(
     file_ext = Path(file.filename).suffix
     upload_path = Path(settings.upload_dir) / f"{file_id}{file_ext}"
 
-    async with aiofiles.open(upload_path, "wb") as f:
-        content = await file.read()
-        await f.write(content)
+    key = await _save_upload(file, upload_path)
 
-    try:
-        # Run diarization in thread pool
-        import asyncio
+    # Speaker bounds change the result, so they are part of the cache key
+    cache_path = _cache_path(key, "diarize", min_speakers, max_speakers, suffix=".json")
+    cached = await asyncio.to_thread(_read_cache, cache_path)
+    if cached is not None:
+        try:
+            result = DiarizationResult.model_validate_json(cached)
+            upload_path.unlink()
+            logger.info(f"Diarization cache hit for {file.filename}")
+            return result
+        except ValueError as e:
+            logger.warning(f"Ignoring unreadable cached result: {e}")
 
-        loop = asyncio.get_event_loop()
+    try:
+        # Run diarization on the engine thread
+        loop = asyncio.get_running_loop()
         result = await loop.run_in_executor(
-            None,
+            engine_executor,
             lambda: engine.diarize(
                 audio_path=upload_path,
                 min_speakers=min_speakers,
                 max_speakers=max_speakers,
             ),
         )
+
+        await asyncio.to_thread(_write_cache, cache_path, result.model_dump_json().encode())
+
         return result
 
     except Exception as e:
@@ -151,18 +275,28 @@ async def extract_embeddings(
     file_ext = Path(file.filename).suffix
     upload_path = Path(settings.upload_dir) / f"{file_id}{file_ext}"
 
-    async with aiofiles.open(upload_path, "wb") as f:
-        content = await file.read()
-        await f.write(content)
+    key = await _save_upload(file, upload_path)
 
-    try:
-        import asyncio
+    cache_path = _cache_path(key, "embeddings", suffix=".npz")
+    cached = await asyncio.to_thread(_read_cache, cache_path)
+    if cached is not None:
+        try:
+            embeddings = _load_embeddings(cached)
+            upload_path.unlink()
+            logger.info(f"Embedding cache hit for {file.filename}")
+            return embeddings
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cached embeddings: {e}")
 
-        loop = asyncio.get_event_loop()
+    try:
+        loop = asyncio.get_running_loop()
         embeddings = await loop.run_in_executor(
-            None,
+            engine_executor,
             lambda: engine.get_embeddings(audio_path=upload_path),
         )
+
+        await asyncio.to_thread(_write_cache, cache_path, _dump_embeddings(embeddings))
+
         return embeddings
 
     except Exception as e:
@@ -178,7 +312,7 @@ async def extract_embeddings(
 @app.get("/speakers", response_model=list[SpeakerProfile], tags=["Speakers"])
 async def list_speakers() -> list[SpeakerProfile]:
     """List all speaker profiles."""
-    return list(speaker_profiles.values())
+    return profile_store.list()
 
 
 @app.post("/speakers", response_model=SpeakerProfile, tags=["Speakers"])
@@ -195,24 +329,24 @@ async def create_speaker(profile: SpeakerProfileCreate) -> SpeakerProfile:
         created_at=now,
         updated_at=now,
     )
-    speaker_profiles[profile_id] = speaker
+    profile_store.put(speaker)
     return speaker
 
 
 @app.get("/speakers/{profile_id}", response_model=SpeakerProfile, tags=["Speakers"])
 async def get_speaker(profile_id: str) -> SpeakerProfile:
     """Get a speaker profile by ID."""
-    if profile_id not in speaker_profiles:
+    speaker = profile_store.get(profile_id)
+    if speaker is None:
         raise HTTPException(status_code=404, detail="Speaker profile not found")
-    return speaker_profiles[profile_id]
+    return speaker
 
 
 @app.delete("/speakers/{profile_id}", tags=["Speakers"])
 async def delete_speaker(profile_id: str) -> dict[str, bool]:
     """Delete a speaker profile."""
-    if profile_id not in speaker_profiles:
+    if not profile_store.delete(profile_id):
         raise HTTPException(status_code=404, detail="Speaker profile not found")
-    del speaker_profiles[profile_id]
     return {"success": True}
 
 
@@ -224,4 +358,6 @@ if __name__ == "__main__":
         host=settings.host,
         port=settings.port,
         reload=settings.debug,
+        workers=None if settings.debug else settings.workers,
+        loop="uvloop",
     )
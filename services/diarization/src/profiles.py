@@ -0,0 +1,104 @@
+"""SQLite-backed speaker profile storage."""
+
+import sqlite3
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from src.config import settings
+from src.schemas import SpeakerProfile
+
+
+class SpeakerProfileStore:
+    """Speaker profiles shared by every worker process.
+
+    WAL mode lets readers in other workers proceed while one writes.
+    Embeddings are stored as raw float32 bytes in their own table so
+    profile rows stay small.
+    """
+
+    def __init__(self, db_path: str | Path) -> None:
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(
+            str(db_path),
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._lock = threading.Lock()
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS profiles (id TEXT PRIMARY KEY, json TEXT NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS profile_embeddings "
+            "(id TEXT PRIMARY KEY, embedding BLOB NOT NULL)"
+        )
+
+    def _to_profile(self, profile_json: str, embedding: bytes | None) -> SpeakerProfile:
+        """Build a profile from its stored JSON and embedding bytes."""
+        profile = SpeakerProfile.model_validate_json(profile_json)
+        if embedding is not None:
+            profile.embedding = np.frombuffer(embedding, dtype=np.float32).tolist()
+        return profile
+
+    def list(self) -> list[SpeakerProfile]:
+        """Get all speaker profiles."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT p.json, e.embedding FROM profiles p "
+                "LEFT JOIN profile_embeddings e ON e.id = p.id"
+            ).fetchall()
+        return [self._to_profile(profile_json, embedding) for profile_json, embedding in rows]
+
+    def get(self, profile_id: str) -> SpeakerProfile | None:
+        """Get a speaker profile by ID."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT p.json, e.embedding FROM profiles p "
+                "LEFT JOIN profile_embeddings e ON e.id = p.id WHERE p.id = ?",
+                (profile_id,),
+            ).fetchone()
+        return self._to_profile(*row) if row else None
+
+    def put(self, profile: SpeakerProfile) -> None:
+        """Insert or replace a speaker profile."""
+        profile_json = profile.model_dump_json(exclude={"embedding"})
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO profiles (id, json) VALUES (?, ?)",
+                    (profile.id, profile_json),
+                )
+                if profile.embedding is None:
+                    self._db.execute(
+                        "DELETE FROM profile_embeddings WHERE id = ?", (profile.id,)
+                    )
+                else:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO profile_embeddings (id, embedding) VALUES (?, ?)",
+                        (profile.id, np.asarray(profile.embedding, dtype=np.float32).tobytes()),
+                    )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def delete(self, profile_id: str) -> bool:
+        """Delete a speaker profile. Returns False if it did not exist."""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                deleted = self._db.execute(
+                    "DELETE FROM profiles WHERE id = ?", (profile_id,)
+                ).rowcount
+                self._db.execute("DELETE FROM profile_embeddings WHERE id = ?", (profile_id,))
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        return deleted > 0
+
+
+profile_store = SpeakerProfileStore(Path(settings.embeddings_dir) / "speakers.db")
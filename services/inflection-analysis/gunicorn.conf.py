@@ -0,0 +1,45 @@
+"""Gunicorn configuration for the inflection analysis service."""
+
+from src.config import settings
+
+bind = f"{settings.host}:{settings.port}"
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# A cold emotion model load (or first download) can take minutes, well past
+# the 30 s default after which a silent worker is killed and restarted
+timeout = 300
+graceful_timeout = 30
+
+# On CPU, import the app (and load the emotion model's weights) once in the
+# master so workers share them copy-on-write. CUDA state does not survive
+# fork(), so GPU deployments run a single worker that loads the model itself
+# and get concurrency from the analysis thread pool instead.
+if settings.compute_device == "cpu":
+    preload_app = True
+    workers = settings.api_workers
+
+    _torch_threads: int | None = None
+
+    def when_ready(server):
+        """Load the weights in the master, after the app import and before forking."""
+        global _torch_threads
+        import torch
+
+        from src.main import _init_analyzers
+
+        # Reading the checkpoint can run parallel torch copies; with a single
+        # intra-op thread OpenMP never starts a thread team in the master, so
+        # forked workers do not inherit one (a known GNU OpenMP deadlock)
+        _torch_threads = torch.get_num_threads()
+        torch.set_num_threads(1)
+        _init_analyzers()
+
+    def post_fork(server, worker):
+        """Give each worker the intra-op threads the master was denied."""
+        import torch
+
+        if _torch_threads is not None:
+            torch.set_num_threads(_torch_threads)
+else:
+    preload_app = False
+    workers = 1
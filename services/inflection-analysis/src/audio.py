@@ -0,0 +1,117 @@
+"""Audio loading helpers shared by the analyzers."""
+
+import struct
+from functools import lru_cache
+from pathlib import Path
+
+import librosa
+import numpy as np
+import soundfile as sf
+
+from src.audio_cache import get_cached_audio
+from src.config import settings
+
+
+@lru_cache(maxsize=256)
+def _native_sample_rate(path: str, mtime_ns: int) -> int:
+    """Read (and cache) the sample rate from an audio file's header.
+
+    The modification time is part of the key so a rewritten file is re-read.
+    """
+    return sf.info(path).samplerate
+
+
+def _wav_data_offset(path: str) -> int | None:
+    """Find the byte offset of the sample data in a RIFF/WAVE file."""
+    with open(path, "rb") as f:
+        riff, _, wave = struct.unpack("<4sI4s", f.read(12))
+        if riff != b"RIFF" or wave != b"WAVE":
+            return None
+
+        while header := f.read(8):
+            if len(header) < 8:
+                return None
+            chunk_id, size = struct.unpack("<4sI", header)
+            if chunk_id == b"data":
+                return f.tell()
+            # Chunks are word-aligned
+            f.seek(size + (size & 1), 1)
+
+    return None
+
+
+@lru_cache(maxsize=16)
+def open_pcm_memmap(path: str, mtime_ns: int) -> tuple[np.memmap, int] | None:
+    """Memory-map the samples of a 16-bit PCM WAV file.
+
+    Only the pages an excerpt touches are read from disk. Returns
+    (frames x channels int16 array, sample rate), or None for other formats.
+    """
+    info = sf.info(path)
+    if info.format != "WAV" or info.subtype != "PCM_16":
+        return None
+
+    offset = _wav_data_offset(path)
+    if offset is None:
+        return None
+
+    data = np.memmap(path, dtype="<i2", mode="r", offset=offset, shape=(info.frames, info.channels))
+    return data, info.samplerate
+
+
+def load_excerpt(
+    audio_path: Path,
+    sample_rate: int,
+    start_time: float | None,
+    end_time: float | None,
+) -> np.ndarray:
+    """Load a mono segment of an audio file at the given sample rate.
+
+    Files already in the decoded-audio cache are sliced without any I/O,
+    and large PCM WAVs are read through a memory map. Otherwise libsndfile
+    seeks straight to the first frame instead of decoding everything
+    before the offset. Formats it cannot read go through librosa.
+    """
+    cached = get_cached_audio(audio_path, sample_rate)
+    if cached is not None:
+        start = int((start_time or 0) * sample_rate)
+        stop = int(end_time * sample_rate) if end_time is not None else None
+        return cached[start:stop]
+
+    stat = audio_path.stat()
+    if stat.st_size > settings.memmap_threshold_bytes:
+        mapped = open_pcm_memmap(str(audio_path), stat.st_mtime_ns)
+        if mapped is not None:
+            data, native_sr = mapped
+            start = int((start_time or 0) * native_sr)
+            stop = int(end_time * native_sr) if end_time is not None else None
+            audio = data[start:stop].mean(axis=1, dtype=np.float32) * np.float32(1 / 32768)
+            if native_sr != sample_rate:
+                audio = librosa.resample(audio, orig_sr=native_sr, target_sr=sample_rate, res_type="soxr_hq")
+            return audio
+
+    try:
+        native_sr = _native_sample_rate(str(audio_path), audio_path.stat().st_mtime_ns)
+    except sf.LibsndfileError:
+        audio, _ = librosa.load(
+            str(audio_path),
+            sr=sample_rate,
+            offset=start_time or 0,
+            duration=(end_time - (start_time or 0)) if end_time is not None else None,
+        )
+        return audio
+
+    audio, _ = sf.read(
+        str(audio_path),
+        start=int((start_time or 0) * native_sr),
+        stop=int(end_time * native_sr) if end_time is not None else None,
+        dtype="float32",
+        always_2d=False,
+    )
+
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)
+    if native_sr != sample_rate:
+        audio = librosa.resample(audio, orig_sr=native_sr, target_sr=sample_rate, res_type="soxr_hq")
+
+    return audio
@@ -0,0 +1,61 @@
+"""Process-wide cache of decoded audio files."""
+
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+from src.config import settings
+
+# (path, sample rate, mtime_ns) -> read-only mono audio
+_cache: OrderedDict[tuple[str, int, int], np.ndarray] = OrderedDict()
+_cache_bytes = 0
+_lock = threading.Lock()
+
+
+def _key(path: Path, sample_rate: int) -> tuple[str, int, int]:
+    # The modification time is part of the key so a rewritten file misses
+    return (str(path.resolve()), sample_rate, path.stat().st_mtime_ns)
+
+
+def get_cached_audio(path: Path, sample_rate: int) -> np.ndarray | None:
+    """Get a previously decoded file, or None if it is not cached."""
+    key = _key(path, sample_rate)
+    with _lock:
+        audio = _cache.get(key)
+        if audio is not None:
+            _cache.move_to_end(key)
+        return audio
+
+
+def get_audio(path: Path, sample_rate: int) -> np.ndarray:
+    """Get a whole file as mono audio at the given rate, decoding it on a miss.
+
+    The returned array is read-only and shared; slice it freely (slices are
+    views) but copy before modifying.
+    """
+    global _cache_bytes
+
+    audio = get_cached_audio(path, sample_rate)
+    if audio is not None:
+        return audio
+
+    from src.audio import load_excerpt
+
+    audio = load_excerpt(path, sample_rate, None, None)
+    audio.flags.writeable = False
+    if audio.nbytes > settings.audio_cache_bytes:
+        return audio
+
+    key = _key(path, sample_rate)
+    with _lock:
+        if key not in _cache:
+            _cache[key] = audio
+            _cache_bytes += audio.nbytes
+        # Evict least recently used files until under the byte budget
+        while _cache_bytes > settings.audio_cache_bytes:
+            _, evicted = _cache.popitem(last=False)
+            _cache_bytes -= evicted.nbytes
+
+    return audio
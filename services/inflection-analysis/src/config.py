@@ -1,5 +1,7 @@
 """Service configuration."""
 
+import os
+
 import torch
 from pydantic_settings import BaseSettings
 
@@ -15,14 +17,28 @@ class Settings(BaseSettings):
     host: str = "0.0.0.0"
     port: int = 8004
     debug: bool = False
+    api_workers: int = 2  # Gunicorn worker processes (CPU only; CUDA uses one)
 
     # Analysis settings
     min_confidence: float = 0.5  # Minimum confidence for ML predictions
-    sample_rate: int = 16000  # Target sample rate for analysis
+    sample_rate: int = 16000  # Target sample rate for the emotion model
+    analysis_sample_rate: int = 8000  # Sample rate for prosodic analysis
     pitch_floor_hz: float = 75.0  # Minimum pitch for F0 extraction
     pitch_ceiling_hz: float = 500.0  # Maximum pitch for F0 extraction
+    pitch_method: str = "world"  # world (DIO + StoneMask) or praat
     pause_threshold_db: float = -40.0  # Threshold for pause detection
     min_pause_duration: float = 0.25  # Minimum pause duration in seconds
+    audio_cache_bytes: int = 2 * 1024**3  # Budget for decoded audio kept in memory
+    result_cache_size: int = 1024  # /analyze results kept for repeat requests (0 disables)
+    memmap_threshold_bytes: int = 512 * 1024**2  # Larger files are memory-mapped, not decoded whole
+    analysis_workers: int = os.cpu_count() or 4  # Threads for prosody/emotion analysis
+    max_concurrent_requests: int = 8  # Requests analyzed at once; others wait their turn
+
+    # Inference settings
+    compile_model: bool = True  # torch.compile the emotion model forward pass
+    quantize: bool = True  # int8 dynamic quantization on CPU (PyTorch or ONNX Runtime)
+    use_onnx_runtime: bool = False  # Export to ONNX and infer with onnxruntime
+    emotion_batch_size: int = 8  # Batch segments per emotion model forward pass
 
     # Cache settings
     model_cache_dir: str | None = None
@@ -1,13 +1,18 @@
 """Emotion detection using Wav2Vec2 and prosodic heuristics."""
 
 import logging
+import os
+import threading
+import uuid
+from collections.abc import Callable
 from pathlib import Path
 
-import librosa
 import numpy as np
 import torch
+from scipy.special import softmax
 from transformers import AutoModelForAudioClassification, AutoFeatureExtractor
 
+from src.audio import load_excerpt
 from src.config import settings
 from src.schemas import EmotionDistribution, EmotionResult
 
@@ -15,6 +20,33 @@ logger = logging.getLogger(__name__)
 
 # Standard emotion labels used across models
 EMOTION_LABELS = ["angry", "fearful", "happy", "neutral", "sad", "surprised"]
+_STANDARD_INDEX = {label: i for i, label in enumerate(EMOTION_LABELS)}
+
+# Substrings of model labels mapped to standard labels (first match wins)
+_LABEL_MAPPING = {
+    "ang": "angry",
+    "anger": "angry",
+    "fear": "fearful",
+    "hap": "happy",
+    "happiness": "happy",
+    "joy": "happy",
+    "neu": "neutral",
+    "calm": "neutral",
+    "sad": "sad",
+    "sadness": "sad",
+    "sur": "surprised",
+    "surprise": "surprised",
+    "disgust": "angry",  # Map disgust to angry as fallback
+}
+
+
+def _standard_label_index(model_label: str) -> int:
+    """Get the EMOTION_LABELS index for a model label, or -1 if it has none."""
+    model_label = model_label.lower()
+    for key, standard in _LABEL_MAPPING.items():
+        if key in model_label:
+            return _STANDARD_INDEX[standard]
+    return _STANDARD_INDEX.get(model_label, -1)
 
 
 class EmotionAnalyzer:
@@ -27,9 +59,25 @@ class EmotionAnalyzer:
         self.min_confidence = settings.min_confidence
         self.sample_rate = settings.sample_rate
         self._model_labels: list[str] = []
+        self._label_index = np.empty(0, dtype=np.int64)
+        self._infer = self._forward_probs
+        self._ort_session = None
+        self._prepared = False
+        # Batch segments are analyzed from several threads; one forward pass
+        # at a time keeps device memory bounded
+        self._infer_lock = threading.Lock()
 
     def load_model(self) -> None:
-        """Load the emotion detection model."""
+        """Load the emotion detection model and prepare it for inference."""
+        self.load_weights()
+        self.prepare_inference()
+
+    def load_weights(self) -> None:
+        """Load the pretrained weights and labels, without optimizing them.
+
+        This only reads the checkpoint, so it is safe to run in a process
+        that forks afterwards; see prepare_inference() for the rest.
+        """
         if self.model is not None:
             return
 
@@ -58,12 +106,146 @@ class EmotionAnalyzer:
             else:
                 self._model_labels = EMOTION_LABELS
 
+            # Resolve model labels to standard labels once, not per inference
+            self._label_index = np.array(
+                [_standard_label_index(label) for label in self._model_labels],
+                dtype=np.int64,
+            )
+
             logger.info(f"Model loaded with labels: {self._model_labels}")
 
         except Exception as e:
             logger.error(f"Failed to load emotion model: {e}")
             raise
 
+    def prepare_inference(self) -> None:
+        """Quantize, export to ONNX Runtime and/or compile the loaded model.
+
+        These run torch CPU kernels (starting its OpenMP pool) and open ORT
+        sessions, neither of which survives fork(), so each worker process
+        calls this itself after the weights are loaded.
+        """
+        if self.model is None or self._prepared:
+            return
+
+        try:
+            if settings.use_onnx_runtime:
+                self._ort_session = self._load_onnx_session()
+
+            if self._ort_session is None and self.device == "cpu" and settings.quantize:
+                # int8 weights cut memory traffic and use VNNI/AVX2 int8 GEMMs
+                self.model = torch.ao.quantization.quantize_dynamic(
+                    self.model,
+                    {torch.nn.Linear},
+                    dtype=torch.qint8,
+                )
+
+            if self._ort_session is None and settings.compile_model:
+                # Shapes vary with segment length, so compile dynamically;
+                # CUDA graphs only pay off on the GPU
+                self._infer = torch.compile(
+                    self._forward_probs,
+                    mode="reduce-overhead" if self.device == "cuda" else "default",
+                    dynamic=True,
+                )
+
+            self._prepared = True
+
+        except Exception as e:
+            logger.error(f"Failed to prepare emotion model: {e}")
+            raise
+
+    def _load_onnx_session(self):
+        """Export the model to ONNX (once) and open an ONNX Runtime session.
+
+        Returns None, leaving inference on PyTorch, if onnxruntime is not
+        installed or the export fails.
+        """
+        try:
+            import onnxruntime
+        except ImportError:
+            logger.warning("onnxruntime not installed, using PyTorch inference")
+            return None
+
+        cache_dir = Path(settings.model_cache_dir or Path.home() / ".cache" / "inflection-analysis")
+        onnx_path = cache_dir / f"{settings.model_name.replace('/', '--')}.onnx"
+
+        try:
+            if not onnx_path.exists():
+                logger.info(f"Exporting emotion model to {onnx_path}")
+                cache_dir.mkdir(parents=True, exist_ok=True)
+                tmp_path = onnx_path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+                dummy_input = torch.zeros(1, self.sample_rate, device=self.device)
+                torch.onnx.export(
+                    self.model,
+                    (dummy_input,),
+                    str(tmp_path),
+                    input_names=["input_values"],
+                    output_names=["logits"],
+                    dynamic_axes={"input_values": {0: "batch", 1: "samples"}, "logits": {0: "batch"}},
+                    opset_version=17,
+                )
+                os.replace(tmp_path, onnx_path)
+
+            if self.device == "cpu" and settings.quantize:
+                onnx_path = self._quantize_onnx(onnx_path)
+
+            options = onnxruntime.SessionOptions()
+            options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+            providers = ["CPUExecutionProvider"]
+            if self.device == "cuda":
+                providers.insert(0, "CUDAExecutionProvider")
+            session = onnxruntime.InferenceSession(
+                str(onnx_path),
+                sess_options=options,
+                providers=providers,
+            )
+            logger.info(f"Using ONNX Runtime ({session.get_providers()[0]})")
+            return session
+
+        except Exception as e:
+            logger.warning(f"ONNX export failed, using PyTorch inference: {e}")
+            return None
+
+    def _quantize_onnx(self, onnx_path: Path) -> Path:
+        """Quantize an exported model's weights to int8 (once), returning its path."""
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        int8_path = onnx_path.with_name(f"{onnx_path.stem}-int8.onnx")
+        if not int8_path.exists():
+            logger.info(f"Quantizing ONNX model to {int8_path}")
+            tmp_path = int8_path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+            quantize_dynamic(str(onnx_path), str(tmp_path), weight_type=QuantType.QInt8)
+            os.replace(tmp_path, int8_path)
+        return int8_path
+
+    def _forward_probs(
+        self,
+        input_values: torch.Tensor,
+        attention_mask: torch.Tensor | None = None,
+    ) -> torch.Tensor:
+        """Run the model and return class probabilities."""
+        logits = self.model(input_values=input_values, attention_mask=attention_mask).logits
+        return torch.nn.functional.softmax(logits, dim=-1)
+
+    def _run_inference(
+        self,
+        input_values: torch.Tensor,
+        attention_mask: torch.Tensor | None = None,
+    ) -> np.ndarray:
+        """Run inference, keeping results on device until the final copy."""
+        with self._infer_lock, torch.inference_mode():
+            try:
+                probs = self._infer(input_values, attention_mask)
+            except Exception as e:
+                if self._infer == self._forward_probs:
+                    raise
+                logger.warning(f"Compiled inference failed, using eager mode: {e}")
+                self._infer = self._forward_probs
+                probs = self._infer(input_values, attention_mask)
+            return probs.cpu().numpy()
+
     def is_loaded(self) -> bool:
         """Check if model is loaded."""
         return self.model is not None
@@ -90,37 +272,144 @@ class EmotionAnalyzer:
         if not audio_path.exists():
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
 
-        # Try ML-based detection first
-        if self.model is not None:
-            try:
-                result = self._analyze_ml(audio_path, start_time, end_time)
-                if result.confidence >= self.min_confidence:
-                    return result
-                logger.info(
-                    f"ML confidence {result.confidence:.2f} below threshold, "
-                    f"falling back to prosodic heuristics"
-                )
-            except Exception as e:
-                logger.warning(f"ML analysis failed: {e}, using prosodic fallback")
+        # Try ML-based detection first, loading only the requested segment
+        result = self._try_ml(
+            lambda: load_excerpt(audio_path, self.sample_rate, start_time, end_time)
+        )
+        if result is not None:
+            return result
 
         # Fallback to prosodic heuristics
         return self._analyze_prosodic(audio_path, start_time, end_time, prosody_features)
 
-    def _analyze_ml(
+    def analyze_preloaded(
         self,
-        audio_path: Path,
-        start_time: float | None,
-        end_time: float | None,
+        audio: np.ndarray,
+        start_time: float,
+        end_time: float,
+        prosody_features: dict,
     ) -> EmotionResult:
-        """Analyze emotions using ML model."""
-        # Load audio
-        audio, sr = librosa.load(
-            str(audio_path),
-            sr=self.sample_rate,
-            offset=start_time or 0,
-            duration=(end_time - start_time) if start_time and end_time else None,
+        """Analyze emotions in a segment of already-loaded audio.
+
+        Args:
+            audio: Full mono audio at the analyzer's sample rate
+            start_time: Start time in seconds
+            end_time: End time in seconds
+            prosody_features: Prosodic features for fallback
+
+        Returns:
+            EmotionResult with detected emotions
+        """
+        start = int(start_time * self.sample_rate)
+        end = int(end_time * self.sample_rate)
+
+        result = self._try_ml(lambda: audio[start:end])
+        if result is not None:
+            return result
+
+        return self._analyze_prosodic(None, start_time, end_time, prosody_features)
+
+    def analyze_batched(
+        self,
+        audio: np.ndarray,
+        spans: list[tuple[float, float]],
+        prosody_features: list[dict],
+    ) -> list[EmotionResult]:
+        """Analyze emotions in several segments of already-loaded audio.
+
+        Segments are sorted by length and run through the model in padded
+        batches, one forward pass per batch rather than one per segment.
+        Segments a batch could not handle are analyzed individually.
+
+        Args:
+            audio: Full mono audio at the analyzer's sample rate
+            spans: (start_time, end_time) of each segment in seconds
+            prosody_features: Prosodic features for fallback, per segment
+
+        Returns:
+            EmotionResults in the order of spans
+        """
+        results: list[EmotionResult | None] = [None] * len(spans)
+
+        # The ONNX graph takes no attention mask, so it cannot batch padded clips
+        if self.model is not None and self._ort_session is None:
+            clips = [
+                audio[int(start * self.sample_rate):int(end * self.sample_rate)]
+                for start, end in spans
+            ]
+            # Similar lengths in a batch keep padding to a minimum
+            order = sorted(
+                (i for i in range(len(clips)) if len(clips[i])),
+                key=lambda i: len(clips[i]),
+            )
+
+            for b in range(0, len(order), settings.emotion_batch_size):
+                batch = order[b:b + settings.emotion_batch_size]
+                try:
+                    probs = self._infer_batch([clips[i] for i in batch])
+                except Exception as e:
+                    logger.warning(f"Batched ML analysis failed: {e}, analyzing segments individually")
+                    continue
+
+                for i, segment_probs in zip(batch, probs):
+                    try:
+                        result = self._build_ml_result(segment_probs)
+                        if result.confidence >= self.min_confidence:
+                            results[i] = result
+                            continue
+                        logger.info(
+                            f"ML confidence {result.confidence:.2f} below threshold, "
+                            f"falling back to prosodic heuristics"
+                        )
+                    except Exception as e:
+                        logger.warning(f"ML analysis failed: {e}, using prosodic fallback")
+                    results[i] = self._analyze_prosodic(None, *spans[i], prosody_features[i])
+
+        return [
+            result if result is not None
+            else self.analyze_preloaded(audio, *spans[i], prosody_features[i])
+            for i, result in enumerate(results)
+        ]
+
+    def _infer_batch(self, clips: list[np.ndarray]) -> np.ndarray:
+        """Get class probabilities for a batch of clips, one row per clip."""
+        inputs = self.feature_extractor(
+            clips,
+            sampling_rate=self.sample_rate,
+            return_tensors="pt",
+            padding=True,
+            return_attention_mask=True,
         )
 
+        # Copy from pinned host memory so the transfers are asynchronous
+        input_values = inputs["input_values"]
+        attention_mask = inputs["attention_mask"]
+        if self.device == "cuda":
+            input_values = input_values.pin_memory().to(self.device, non_blocking=True)
+            attention_mask = attention_mask.pin_memory().to(self.device, non_blocking=True)
+
+        return self._run_inference(input_values, attention_mask)
+
+    def _try_ml(self, load_audio: Callable[[], np.ndarray]) -> EmotionResult | None:
+        """Run ML detection, or return None if it is unavailable, fails or is not confident."""
+        if self.model is None:
+            return None
+
+        try:
+            result = self._analyze_ml(load_audio())
+            if result.confidence >= self.min_confidence:
+                return result
+            logger.info(
+                f"ML confidence {result.confidence:.2f} below threshold, "
+                f"falling back to prosodic heuristics"
+            )
+        except Exception as e:
+            logger.warning(f"ML analysis failed: {e}, using prosodic fallback")
+
+        return None
+
+    def _analyze_ml(self, audio: np.ndarray) -> EmotionResult:
+        """Analyze emotions in mono audio using ML model."""
         # Extract features
         inputs = self.feature_extractor(
             audio,
@@ -129,23 +418,29 @@ class EmotionAnalyzer:
             padding=True,
         )
 
-        # Move to device
-        inputs = {k: v.to(self.device) for k, v in inputs.items()}
+        if self._ort_session is not None:
+            logits = self._ort_session.run(
+                None, {"input_values": inputs["input_values"].numpy()}
+            )[0]
+            probs = softmax(logits, axis=-1)[0]
+            return self._build_ml_result(probs)
+
+        # Move to device (a single unpadded clip needs no attention mask)
+        input_values = inputs["input_values"].to(self.device)
 
-        # Run inference
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-            probs = torch.nn.functional.softmax(outputs.logits, dim=-1)
-            probs = probs.cpu().numpy()[0]
+        probs = self._run_inference(input_values)[0]
+        return self._build_ml_result(probs)
 
+    def _build_ml_result(self, probs: np.ndarray) -> EmotionResult:
+        """Build an EmotionResult from model class probabilities."""
         # Map to standard labels
         distribution = self._map_to_standard_distribution(probs)
 
         # Find primary emotion
-        primary = max(distribution, key=lambda k: getattr(distribution, k))
+        primary = max(EMOTION_LABELS, key=lambda k: getattr(distribution, k))
         confidence = getattr(distribution, primary)
 
-        return EmotionResult(
+        return EmotionResult.model_construct(
             primary=primary,
             confidence=confidence,
             distribution=distribution,
@@ -157,52 +452,27 @@ class EmotionAnalyzer:
         probs: np.ndarray,
     ) -> EmotionDistribution:
         """Map model output to standard emotion distribution."""
-        # Create mapping from model labels to standard labels
-        distribution = {label: 0.0 for label in EMOTION_LABELS}
-
-        for i, prob in enumerate(probs):
-            if i < len(self._model_labels):
-                model_label = self._model_labels[i].lower()
-
-                # Map common variations
-                label_mapping = {
-                    "ang": "angry",
-                    "anger": "angry",
-                    "fear": "fearful",
-                    "hap": "happy",
-                    "happiness": "happy",
-                    "joy": "happy",
-                    "neu": "neutral",
-                    "calm": "neutral",
-                    "sad": "sad",
-                    "sadness": "sad",
-                    "sur": "surprised",
-                    "surprise": "surprised",
-                    "disgust": "angry",  # Map disgust to angry as fallback
-                }
-
-                # Find matching standard label
-                matched = False
-                for key, standard in label_mapping.items():
-                    if key in model_label:
-                        distribution[standard] += float(prob)
-                        matched = True
-                        break
-
-                # Direct match
-                if not matched and model_label in distribution:
-                    distribution[model_label] += float(prob)
+        n = min(len(probs), len(self._label_index))
+        index = self._label_index[:n]
+        matched = index >= 0
+
+        # Sum probabilities per standard label
+        totals = np.bincount(
+            index[matched],
+            weights=probs[:n][matched],
+            minlength=len(EMOTION_LABELS),
+        )
 
         # Normalize to sum to 1
-        total = sum(distribution.values())
+        total = totals.sum()
         if total > 0:
-            distribution = {k: v / total for k, v in distribution.items()}
+            totals /= total
 
-        return EmotionDistribution(**distribution)
+        return EmotionDistribution.model_construct(**dict(zip(EMOTION_LABELS, totals.tolist())))
 
     def _analyze_prosodic(
         self,
-        audio_path: Path,
+        audio_path: Path | None,
         start_time: float | None,
         end_time: float | None,
         prosody_features: dict | None,
@@ -272,9 +542,9 @@ class EmotionAnalyzer:
         primary = max(distribution, key=distribution.get)
         confidence = distribution[primary]
 
-        return EmotionResult(
+        return EmotionResult.model_construct(
             primary=primary,
             confidence=confidence,
-            distribution=EmotionDistribution(**distribution),
+            distribution=EmotionDistribution.model_construct(**distribution),
             source="prosodic",
         )
@@ -1,20 +1,34 @@
 """FastAPI application for inflection analysis service."""
 
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
+from pathlib import Path
 
+import numpy as np
+import orjson
+import parselmouth
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
+from src.audio_cache import get_audio
 from src.config import settings
 from src.emotion import EmotionAnalyzer
 from src.prosody import ProsodyAnalyzer
+from src.prosody import warmup as warmup_prosody
+from src.result_cache import get_result, put_result, result_key
 from src.schemas import (
     AnalyzeRequest,
     BatchAnalyzeRequest,
     BatchAnalyzeResponse,
+    BatchSegment,
     BatchSegmentResult,
+    ContourFormat,
+    EmotionResult,
     HealthResponse,
     InflectionResult,
+    ProsodyResult,
     SegmentInfo,
 )
 
@@ -28,31 +42,67 @@ logger = logging.getLogger(__name__)
 # Global analyzers
 prosody_analyzer: ProsodyAnalyzer | None = None
 emotion_analyzer: EmotionAnalyzer | None = None
+analysis_executor: ThreadPoolExecutor | None = None
+request_semaphore: asyncio.Semaphore | None = None
 
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """Application lifespan handler."""
+def _init_analyzers() -> None:
+    """Create the analyzers and load the emotion model's weights."""
     global prosody_analyzer, emotion_analyzer
 
-    logger.info("Starting inflection analysis service...")
-
-    # Initialize analyzers
     prosody_analyzer = ProsodyAnalyzer()
     emotion_analyzer = EmotionAnalyzer()
 
     # Load emotion model (can be slow)
     try:
-        emotion_analyzer.load_model()
+        emotion_analyzer.load_weights()
     except Exception as e:
         logger.warning(f"Failed to load emotion model: {e}")
         logger.warning("Emotion analysis will use prosodic heuristics only")
 
+
+# Under gunicorn's preload_app, gunicorn.conf.py calls _init_analyzers() in the
+# master so forked workers share the raw weights copy-on-write; otherwise the
+# lifespan loads them. Either way each process quantizes/exports/compiles in
+# its own lifespan. Importing this module never loads the model.
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan handler."""
+    global analysis_executor, request_semaphore
+
+    logger.info("Starting inflection analysis service...")
+
+    # Not already loaded by the gunicorn master
+    if emotion_analyzer is None:
+        _init_analyzers()
+
+    # Per process: quantized models, ORT sessions and torch.compile wrappers
+    # are not fork-safe, so they are never built before the fork
+    try:
+        emotion_analyzer.prepare_inference()
+    except Exception as e:
+        logger.warning(f"Failed to optimize emotion model, using it as loaded: {e}")
+
+    # Compile the numba kernels now rather than on the first request
+    warmup_prosody()
+
+    # librosa/Praat release the GIL in native code, so threads scale
+    analysis_executor = ThreadPoolExecutor(
+        max_workers=settings.analysis_workers,
+        thread_name_prefix="analysis",
+    )
+    # Bounds in-flight requests so a burst of clients cannot queue more work
+    # than the pool drains, oversubscribing the CPU with decoded audio
+    request_semaphore = asyncio.Semaphore(settings.max_concurrent_requests)
+
     logger.info("Service ready")
 
     yield
 
     logger.info("Shutting down inflection analysis service...")
+    analysis_executor.shutdown(wait=False, cancel_futures=True)
 
 
 app = FastAPI(
@@ -60,6 +110,9 @@ app = FastAPI(
     description="Voice inflection and emotion analysis for Verbatim Studio",
     version="0.1.0",
     lifespan=lifespan,
+    # Pitch contours can hold tens of thousands of points; orjson encodes
+    # them far faster than the stdlib encoder
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -73,6 +126,51 @@ async def health_check():
     )
 
 
+def _prosody_features(prosody: ProsodyResult) -> dict:
+    """Get the prosody features used for the emotion fallback heuristics."""
+    return {
+        "pitch_mean": prosody.pitch_mean_hz,
+        "pitch_std": prosody.pitch_std_hz,
+        "volume_mean": prosody.volume_mean_db,
+        "volume_std": prosody.volume_std_db,
+        "speech_rate": prosody.speech_rate_syllables_per_sec,
+    }
+
+
+def _analyze_request(request: AnalyzeRequest) -> InflectionResult:
+    """Run prosody and emotion analysis for a single request."""
+    # Analyze prosody
+    prosody = prosody_analyzer.analyze(
+        request.audio_path,
+        request.start_time,
+        request.end_time,
+        request.contour_format,
+    )
+
+    # Analyze emotion with prosody features for potential fallback
+    emotion = emotion_analyzer.analyze(
+        request.audio_path,
+        request.start_time,
+        request.end_time,
+        prosody_features=_prosody_features(prosody),
+    )
+
+    # Calculate segment info
+    start = request.start_time or 0
+    end = request.end_time or (start + prosody.speaking_duration + prosody.total_pause_duration)
+    duration = end - start
+
+    return InflectionResult(
+        prosody=prosody,
+        emotion=emotion,
+        segment=SegmentInfo(
+            start=start,
+            end=end,
+            duration=duration,
+        ),
+    )
+
+
 @app.post("/analyze", response_model=InflectionResult)
 async def analyze_audio(request: AnalyzeRequest):
     """Analyze prosodic features and emotions in audio.
@@ -86,43 +184,29 @@ async def analyze_audio(request: AnalyzeRequest):
     if prosody_analyzer is None or emotion_analyzer is None:
         raise HTTPException(status_code=503, detail="Service not initialized")
 
+    loop = asyncio.get_running_loop()
+
     try:
-        # Analyze prosody
-        prosody = prosody_analyzer.analyze(
-            request.audio_path,
-            request.start_time,
-            request.end_time,
-        )
+        # Repeat requests for an unchanged file are served from the cache
+        key = None
+        if settings.result_cache_size > 0:
+            key = result_key(
+                request.audio_path,
+                request.start_time,
+                request.end_time,
+                request.contour_format,
+            )
+            cached = get_result(key)
+            if cached is not None:
+                return cached
 
-        # Analyze emotion with prosody features for potential fallback
-        prosody_features = {
-            "pitch_mean": prosody.pitch_mean_hz,
-            "pitch_std": prosody.pitch_std_hz,
-            "volume_mean": prosody.volume_mean_db,
-            "volume_std": prosody.volume_std_db,
-            "speech_rate": prosody.speech_rate_syllables_per_sec,
-        }
-        emotion = emotion_analyzer.analyze(
-            request.audio_path,
-            request.start_time,
-            request.end_time,
-            prosody_features=prosody_features,
-        )
+        # Analysis is CPU-bound; keep it off the event loop
+        async with request_semaphore:
+            result = await loop.run_in_executor(analysis_executor, _analyze_request, request)
 
-        # Calculate segment info
-        start = request.start_time or 0
-        end = request.end_time or (start + prosody.speaking_duration + prosody.total_pause_duration)
-        duration = end - start
-
-        return InflectionResult(
-            prosody=prosody,
-            emotion=emotion,
-            segment=SegmentInfo(
-                start=start,
-                end=end,
-                duration=duration,
-            ),
-        )
+        if key is not None:
+            put_result(key, result)
+        return result
 
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -145,6 +229,152 @@ async def analyze_segment(request: AnalyzeRequest):
     return await analyze_audio(request)
 
 
+# Pitch contour points per line of a streamed response
+STREAM_CONTOUR_CHUNK = 4096
+
+
+@app.post("/analyze/stream")
+async def analyze_stream(request: AnalyzeRequest):
+    """Analyze audio, streaming the result as NDJSON.
+
+    The first line is the InflectionResult without its pitch contour; each
+    following line holds the next chunk of the contour as
+    {"pitch_contour": [[time, pitch], ...]}. Long segments start sending
+    sooner and are never encoded as one large body.
+    """
+    result = await analyze_audio(request)
+    contour = result.prosody.pitch_contour
+    head = result.model_dump(exclude={"prosody": {"pitch_contour"}})
+
+    def lines():
+        yield orjson.dumps(head) + b"\n"
+        for i in range(0, len(contour), STREAM_CONTOUR_CHUNK):
+            chunk = contour[i:i + STREAM_CONTOUR_CHUNK]
+            yield orjson.dumps({"pitch_contour": chunk}) + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+BatchAudio = tuple[np.ndarray, np.ndarray, int, parselmouth.Sound | None]
+
+
+def _load_batch_audio(audio_path: str) -> BatchAudio | None:
+    """Decode a file once for all batch segments.
+
+    Returns the audio at the emotion model's rate along with the prosody
+    analyzer's prepared (resampled) audio, rate and Sound. Returns None for
+    files above the memory-map threshold: decoding those whole would spike
+    memory, so their segments are read individually from a memory map.
+    """
+    path = Path(audio_path)
+    if not path.exists():
+        raise FileNotFoundError(f"Audio file not found: {path}")
+
+    if path.stat().st_size > settings.memmap_threshold_bytes:
+        return None
+
+    audio = get_audio(path, settings.sample_rate)
+    return (audio, *prosody_analyzer.prepare(audio, settings.sample_rate))
+
+
+def _segment_result(
+    segment: BatchSegment,
+    prosody: ProsodyResult,
+    emotion: EmotionResult,
+) -> BatchSegmentResult:
+    """Combine a batch segment's analyses into its result."""
+    duration = segment.end_time - segment.start_time
+
+    result = InflectionResult(
+        prosody=prosody,
+        emotion=emotion,
+        segment=SegmentInfo(
+            start=segment.start_time,
+            end=segment.end_time,
+            duration=duration,
+        ),
+    )
+    return BatchSegmentResult(id=segment.id, result=result, error=None)
+
+
+def _analyze_segment(
+    audio_path: str,
+    segment: BatchSegment,
+    contour_format: ContourFormat,
+) -> BatchSegmentResult:
+    """Analyze one batch segment, reading it from the file."""
+    try:
+        prosody = prosody_analyzer.analyze(
+            audio_path,
+            segment.start_time,
+            segment.end_time,
+            contour_format,
+        )
+        emotion = emotion_analyzer.analyze(
+            audio_path,
+            segment.start_time,
+            segment.end_time,
+            prosody_features=_prosody_features(prosody),
+        )
+        return _segment_result(segment, prosody, emotion)
+
+    except Exception as e:
+        logger.warning(f"Failed to analyze segment {segment.id}: {e}")
+        return BatchSegmentResult(id=segment.id, result=None, error=str(e))
+
+
+async def _analyze_preloaded_segments(
+    preloaded: BatchAudio,
+    segments: list[BatchSegment],
+    contour_format: ContourFormat,
+) -> list[BatchSegmentResult]:
+    """Analyze batch segments of a decoded file.
+
+    Prosody runs per segment in parallel; emotion then runs once for all
+    segments, which batches them through the model.
+    """
+    loop = asyncio.get_running_loop()
+    audio, prosody_audio, prosody_sr, sound = preloaded
+
+    prosodies = await asyncio.gather(*(
+        loop.run_in_executor(
+            analysis_executor,
+            prosody_analyzer.analyze_preloaded,
+            prosody_audio,
+            prosody_sr,
+            sound,
+            segment.start_time,
+            segment.end_time,
+            contour_format,
+        )
+        for segment in segments
+    ), return_exceptions=True)
+
+    # Failures are reported per segment
+    errors = {i: p for i, p in enumerate(prosodies) if isinstance(p, Exception)}
+    analyzed = [i for i in range(len(segments)) if i not in errors]
+
+    try:
+        emotions = dict(zip(analyzed, await loop.run_in_executor(
+            analysis_executor,
+            emotion_analyzer.analyze_batched,
+            audio,
+            [(segments[i].start_time, segments[i].end_time) for i in analyzed],
+            [_prosody_features(prosodies[i]) for i in analyzed],
+        )))
+    except Exception as e:
+        errors.update(dict.fromkeys(analyzed, e))
+
+    results = []
+    for i, segment in enumerate(segments):
+        if i in errors:
+            logger.warning(f"Failed to analyze segment {segment.id}: {errors[i]}")
+            results.append(BatchSegmentResult(id=segment.id, result=None, error=str(errors[i])))
+        else:
+            results.append(_segment_result(segment, prosodies[i], emotions[i]))
+    return results
+
+
 @app.post("/analyze/batch", response_model=BatchAnalyzeResponse)
 async def analyze_batch(request: BatchAnalyzeRequest):
     """Analyze multiple segments in batch.
@@ -154,47 +384,38 @@ async def analyze_batch(request: BatchAnalyzeRequest):
     if prosody_analyzer is None or emotion_analyzer is None:
         raise HTTPException(status_code=503, detail="Service not initialized")
 
-    results: list[BatchSegmentResult] = []
+    loop = asyncio.get_running_loop()
 
-    for segment in request.segments:
+    async with request_semaphore:
+        # Decode the file once and slice it for every segment
         try:
-            # Analyze this segment
-            prosody = prosody_analyzer.analyze(
-                request.audio_path,
-                segment.start_time,
-                segment.end_time,
+            preloaded = await loop.run_in_executor(
+                analysis_executor, _load_batch_audio, request.audio_path
             )
-
-            prosody_features = {
-                "pitch_mean": prosody.pitch_mean_hz,
-                "pitch_std": prosody.pitch_std_hz,
-                "volume_mean": prosody.volume_mean_db,
-                "volume_std": prosody.volume_std_db,
-                "speech_rate": prosody.speech_rate_syllables_per_sec,
-            }
-            emotion = emotion_analyzer.analyze(
-                request.audio_path,
-                segment.start_time,
-                segment.end_time,
-                prosody_features=prosody_features,
-            )
-
-            duration = segment.end_time - segment.start_time
-
-            result = InflectionResult(
-                prosody=prosody,
-                emotion=emotion,
-                segment=SegmentInfo(
-                    start=segment.start_time,
-                    end=segment.end_time,
-                    duration=duration,
-                ),
-            )
-            results.append(BatchSegmentResult(id=segment.id, result=result, error=None))
-
+        except FileNotFoundError as e:
+            raise HTTPException(status_code=404, detail=str(e))
         except Exception as e:
-            logger.warning(f"Failed to analyze segment {segment.id}: {e}")
-            results.append(BatchSegmentResult(id=segment.id, result=None, error=str(e)))
+            logger.error(f"Failed to load audio: {e}", exc_info=True)
+            raise HTTPException(status_code=500, detail=f"Failed to load audio: {e}")
+
+        if preloaded is not None:
+            results = await _analyze_preloaded_segments(
+                preloaded,
+                request.segments,
+                request.contour_format,
+            )
+        else:
+            # Analyze segments in parallel (failures are reported per segment)
+            results = await asyncio.gather(*(
+                loop.run_in_executor(
+                    analysis_executor,
+                    _analyze_segment,
+                    request.audio_path,
+                    segment,
+                    request.contour_format,
+                )
+                for segment in request.segments
+            ))
 
     return BatchAnalyzeResponse(results=results)
 
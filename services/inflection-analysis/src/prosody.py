@@ -1,34 +1,150 @@
 """Prosodic feature extraction using Praat/Parselmouth and librosa."""
 
+import base64
 import logging
 from pathlib import Path
 
 import librosa
 import numpy as np
 import parselmouth
+import pyworld
+from numba import njit
 from parselmouth.praat import call
 
+from src.audio import load_excerpt
 from src.config import settings
-from src.schemas import PauseInfo, ProsodyResult
+from src.schemas import ContourFormat, PauseInfo, PitchContourBinary, ProsodyResult
 
 logger = logging.getLogger(__name__)
 
+FRAME_SECONDS = 0.025  # Energy frame length
+HOP_SECONDS = 0.010  # Energy frame hop
+
+# Syllables are rarely closer than this, even in fast speech
+MIN_ONSET_INTERVAL = 0.1
+
+
+@njit(cache=True, fastmath=True)
+def _count_onsets(
+    rms_db: np.ndarray,
+    hop_s: float,
+    min_interval: float,
+    floor_db: float,
+) -> int:
+    """Count energy onsets (syllable nuclei proxies) in a frame energy track.
+
+    Peaks of the smoothed positive energy derivative above an adaptive
+    threshold, at least min_interval apart and louder than floor_db.
+    """
+    n = rms_db.shape[0]
+    if n < 3:
+        return 0
+
+    # Smooth with a 5-frame (50 ms) moving average
+    smoothed = np.empty(n)
+    for i in range(n):
+        lo = max(0, i - 2)
+        hi = min(n, i + 3)
+        total = 0.0
+        for j in range(lo, hi):
+            total += rms_db[j]
+        smoothed[i] = total / (hi - lo)
+
+    # Half-wave rectified first difference (rising energy only)
+    flux = np.zeros(n)
+    for i in range(1, n):
+        d = smoothed[i] - smoothed[i - 1]
+        if d > 0:
+            flux[i] = d
+
+    threshold = flux.mean() + flux.std()
+    min_gap = min_interval / hop_s
+
+    count = 0
+    last = -min_gap
+    for i in range(1, n - 1):
+        if (
+            flux[i] > threshold
+            and flux[i] >= flux[i - 1]
+            and flux[i] >= flux[i + 1]
+            and smoothed[i] > floor_db
+            and i - last >= min_gap
+        ):
+            count += 1
+            last = i
+
+    return count
+
+
+@njit(cache=True, fastmath=True)
+def _stats_above(values: np.ndarray, floor: float) -> tuple[int, float, float, float, float]:
+    """Count, mean, std, min and max of the values above floor, in one pass."""
+    count = 0
+    total = 0.0
+    total_sq = 0.0
+    vmin = 0.0
+    vmax = 0.0
+    for v in values:
+        if v > floor:
+            if count == 0 or v < vmin:
+                vmin = v
+            if count == 0 or v > vmax:
+                vmax = v
+            count += 1
+            total += v
+            total_sq += v * v
+
+    if count == 0:
+        return 0, 0.0, 0.0, 0.0, 0.0
+
+    mean = total / count
+    std = np.sqrt(max(total_sq / count - mean * mean, 0.0))
+    return count, mean, std, vmin, vmax
+
+
+def _pack_contour(times: np.ndarray, freqs: np.ndarray) -> PitchContourBinary:
+    """Pack a pitch contour as base64 float32 arrays."""
+    return PitchContourBinary.model_construct(
+        encoding="base64-f32",
+        times=base64.b64encode(times.astype("<f4").tobytes()).decode("ascii"),
+        freqs=base64.b64encode(freqs.astype("<f4").tobytes()).decode("ascii"),
+        count=len(times),
+    )
+
+
+def warmup() -> None:
+    """JIT-compile the numba kernels (or load them from cache) ahead of requests."""
+    _count_onsets(np.zeros(16), HOP_SECONDS, MIN_ONSET_INTERVAL, -40.0)
+    _stats_above(np.zeros(16), 0.0)
+    _stats_above(np.zeros(16, dtype=np.float32), 0.0)
+
+
+def _to_sound(audio: np.ndarray, sr: int) -> parselmouth.Sound:
+    """Wrap already-decoded mono audio in a Parselmouth Sound (no second decode)."""
+    return parselmouth.Sound(
+        values=np.ascontiguousarray(audio[np.newaxis, :], dtype=np.float64),
+        sampling_frequency=float(sr),
+    )
+
 
 class ProsodyAnalyzer:
     """Extracts prosodic features from audio."""
 
     def __init__(self):
-        self.sample_rate = settings.sample_rate
+        # Pitch, energy and onsets all live well below 4 kHz
+        self.sample_rate = settings.analysis_sample_rate
         self.pitch_floor = settings.pitch_floor_hz
         self.pitch_ceiling = settings.pitch_ceiling_hz
         self.pause_threshold_db = settings.pause_threshold_db
         self.min_pause_duration = settings.min_pause_duration
+        self.pitch_method = settings.pitch_method
 
     def analyze(
         self,
         audio_path: str | Path,
         start_time: float | None = None,
         end_time: float | None = None,
+        contour_format: ContourFormat = "json",
     ) -> ProsodyResult:
         """Analyze prosodic features of audio.
 
@@ -36,6 +152,7 @@ class ProsodyAnalyzer:
             audio_path: Path to audio file
             start_time: Optional start time in seconds
             end_time: Optional end time in seconds
+            contour_format: Return the pitch contour as JSON pairs or binary
 
         Returns:
             ProsodyResult with prosodic features
@@ -44,40 +161,106 @@ class ProsodyAnalyzer:
         if not audio_path.exists():
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
 
-        # Load audio with librosa
-        audio, sr = librosa.load(
-            str(audio_path),
-            sr=self.sample_rate,
-            offset=start_time or 0,
-            duration=(end_time - start_time) if start_time and end_time else None,
-        )
+        # Load only the requested excerpt
+        audio = load_excerpt(audio_path, self.sample_rate, start_time, end_time)
+        sr = self.sample_rate
 
-        duration = len(audio) / sr
+        # Wrap the decoded excerpt for Praat pitch analysis
+        sound = _to_sound(audio, sr) if self.pitch_method == "praat" else None
 
-        # Load with Parselmouth for pitch analysis
-        sound = parselmouth.Sound(str(audio_path))
-        if start_time is not None or end_time is not None:
-            sound = sound.extract_part(
-                from_time=start_time or 0,
-                to_time=end_time or sound.get_total_duration(),
-            )
+        return self._analyze_audio(audio, sr, sound, contour_format)
+
+    def prepare(
+        self,
+        audio: np.ndarray,
+        sr: int,
+    ) -> tuple[np.ndarray, int, parselmouth.Sound | None]:
+        """Prepare decoded audio for repeated analyze_preloaded() calls.
+
+        Args:
+            audio: Full mono audio
+            sr: Sample rate of audio
+
+        Returns:
+            Tuple of (mono audio at the analysis sample rate, sample rate,
+            Parselmouth Sound of the same samples, or None unless Praat
+            pitch extraction is configured)
+        """
+        if sr != self.sample_rate:
+            audio = librosa.resample(audio, orig_sr=sr, target_sr=self.sample_rate, res_type="soxr_hq")
+            sr = self.sample_rate
+
+        sound = _to_sound(audio, sr) if self.pitch_method == "praat" else None
+        return audio, sr, sound
+
+    def analyze_preloaded(
+        self,
+        audio: np.ndarray,
+        sr: int,
+        sound: parselmouth.Sound | None,
+        start_time: float,
+        end_time: float,
+        contour_format: ContourFormat = "json",
+    ) -> ProsodyResult:
+        """Analyze a segment of audio returned by prepare().
+
+        Args:
+            audio: Full mono audio
+            sr: Sample rate of audio
+            sound: Parselmouth Sound of the full file, if loaded
+            start_time: Start time in seconds
+            end_time: End time in seconds
+            contour_format: Return the pitch contour as JSON pairs or binary
+
+        Returns:
+            ProsodyResult with prosodic features
+        """
+        excerpt = audio[int(start_time * sr):int(end_time * sr)]
+        part = None
+        if sound is not None:
+            part = sound.extract_part(from_time=start_time, to_time=end_time)
+        return self._analyze_audio(excerpt, sr, part, contour_format)
+
+    def _analyze_audio(
+        self,
+        audio: np.ndarray,
+        sr: int,
+        sound: parselmouth.Sound | None,
+        contour_format: ContourFormat = "json",
+    ) -> ProsodyResult:
+        """Extract prosodic features from loaded audio."""
+        duration = len(audio) / sr
 
         # Extract features
-        pitch_result = self._extract_pitch(sound)
-        volume_result = self._extract_volume(audio, sr)
-        pauses = self._detect_pauses(audio, sr)
-        speech_rate = self._estimate_speech_rate(audio, sr)
+        if sound is not None:
+            pitch_result = self._extract_pitch(sound)
+        else:
+            pitch_result = self._extract_pitch_world(audio, sr)
+        # Frame energy is shared by the volume and pause features
+        rms_db, frame_times = self._frame_energy(audio, sr)
+        volume_result = self._extract_volume(rms_db)
+        pauses = self._detect_pauses(rms_db, frame_times)
+        speech_rate = self._estimate_speech_rate(rms_db, int(HOP_SECONDS * sr) / sr, duration)
 
         # Calculate speaking duration
-        total_pause = sum(p.duration for p in pauses)
-        speaking_duration = max(0, duration - total_pause)
-
-        return ProsodyResult(
+        total_pause = sum((p.duration for p in pauses), 0.0)
+        speaking_duration = max(0.0, duration - total_pause)
+
+        contour_times, contour_freqs = pitch_result["contour"]
+        if contour_format == "binary":
+            contour = []
+            contour_binary = _pack_contour(contour_times, contour_freqs)
+        else:
+            contour = np.column_stack((contour_times, contour_freqs)).tolist()
+            contour_binary = None
+
+        return ProsodyResult.model_construct(
             pitch_mean_hz=pitch_result["mean"],
             pitch_std_hz=pitch_result["std"],
             pitch_min_hz=pitch_result["min"],
             pitch_max_hz=pitch_result["max"],
-            pitch_contour=pitch_result["contour"],
+            pitch_contour=contour,
+            pitch_contour_binary=contour_binary,
             speech_rate_syllables_per_sec=speech_rate,
             volume_mean_db=volume_result["mean"],
             volume_std_db=volume_result["std"],
@@ -98,91 +281,69 @@ class ProsodyAnalyzer:
                 self.pitch_floor,
                 self.pitch_ceiling,
             )
+            return self._pitch_stats(pitch.selected_array["frequency"], pitch.xs())
+        except Exception as e:
+            logger.warning(f"Pitch extraction failed: {e}")
+            return self._pitch_stats(np.empty(0), np.empty(0))
 
-            # Get pitch values
-            pitch_values = pitch.selected_array["frequency"]
-            pitch_times = pitch.xs()
-
-            # Filter out unvoiced frames (0 Hz)
-            voiced_mask = pitch_values > 0
-            voiced_pitches = pitch_values[voiced_mask]
-
-            # Build pitch contour (time, pitch pairs)
-            contour = [
-                [float(t), float(p)]
-                for t, p in zip(pitch_times, pitch_values)
-                if p > 0
-            ]
-
-            if len(voiced_pitches) == 0:
-                return {
-                    "mean": None,
-                    "std": None,
-                    "min": None,
-                    "max": None,
-                    "contour": [],
-                }
+    def _extract_pitch_world(self, audio: np.ndarray, sr: int) -> dict:
+        """Extract pitch (F0) features using WORLD DIO refined by StoneMask.
 
-            return {
-                "mean": float(np.mean(voiced_pitches)),
-                "std": float(np.std(voiced_pitches)),
-                "min": float(np.min(voiced_pitches)),
-                "max": float(np.max(voiced_pitches)),
-                "contour": contour,
-            }
+        Much faster than Praat's autocorrelation method on long segments,
+        with comparable accuracy for speech.
+        """
+        try:
+            x = audio.astype(np.float64)
+            f0, times = pyworld.dio(
+                x,
+                sr,
+                f0_floor=self.pitch_floor,
+                f0_ceil=self.pitch_ceiling,
+                frame_period=10.0,
+            )
+            f0 = pyworld.stonemask(x, f0, times, sr)
+            return self._pitch_stats(f0, times)
         except Exception as e:
             logger.warning(f"Pitch extraction failed: {e}")
+            return self._pitch_stats(np.empty(0), np.empty(0))
+
+    def _pitch_stats(self, pitch_values: np.ndarray, pitch_times: np.ndarray) -> dict:
+        """Summarize a pitch track; unvoiced frames are 0 Hz."""
+        # Unvoiced frames (0 Hz) are skipped
+        count, mean, std, vmin, vmax = _stats_above(pitch_values, 0.0)
+
+        if count == 0:
             return {
                 "mean": None,
                 "std": None,
                 "min": None,
                 "max": None,
-                "contour": [],
+                "contour": (np.empty(0), np.empty(0)),
             }
 
-    def _extract_volume(self, audio: np.ndarray, sr: int) -> dict:
-        """Extract volume/intensity features."""
-        # Calculate RMS energy in frames
-        frame_length = int(0.025 * sr)  # 25ms frames
-        hop_length = int(0.010 * sr)  # 10ms hop
-
-        rms = librosa.feature.rms(
-            y=audio,
-            frame_length=frame_length,
-            hop_length=hop_length,
-        )[0]
-
-        # Convert to dB
-        rms_db = librosa.amplitude_to_db(rms, ref=1.0)
-
-        # Filter out very quiet frames for statistics
-        active_mask = rms_db > -60
-        active_db = rms_db[active_mask] if np.any(active_mask) else rms_db
-
+        voiced_mask = pitch_values > 0
         return {
-            "mean": float(np.mean(active_db)),
-            "std": float(np.std(active_db)),
-            "min": float(np.min(rms_db)),
-            "max": float(np.max(rms_db)),
+            "mean": mean,
+            "std": std,
+            "min": vmin,
+            "max": vmax,
+            "contour": (pitch_times[voiced_mask], pitch_values[voiced_mask]),
         }
 
-    def _detect_pauses(self, audio: np.ndarray, sr: int) -> list[PauseInfo]:
-        """Detect pauses in audio based on energy threshold."""
-        frame_length = int(0.025 * sr)
-        hop_length = int(0.010 * sr)
+    def _frame_energy(self, audio: np.ndarray, sr: int) -> tuple[np.ndarray, np.ndarray]:
+        """Compute per-frame RMS energy in dB and the frame start times."""
+        frame_length = int(FRAME_SECONDS * sr)
+        hop_length = int(HOP_SECONDS * sr)
 
-        # Calculate RMS energy
         rms = librosa.feature.rms(
             y=audio,
             frame_length=frame_length,
             hop_length=hop_length,
         )[0]
 
+        # Convert to dB
         rms_db = librosa.amplitude_to_db(rms, ref=1.0)
 
-        # Find frames below threshold
-        is_pause = rms_db < self.pause_threshold_db
-
         # Convert frame indices to time
         frame_times = librosa.frames_to_time(
             np.arange(len(rms_db)),
@@ -190,63 +351,78 @@ class ProsodyAnalyzer:
             hop_length=hop_length,
         )
 
-        # Find pause boundaries
-        pauses = []
-        in_pause = False
-        pause_start = 0.0
-
-        for i, (t, p) in enumerate(zip(frame_times, is_pause)):
-            if p and not in_pause:
-                # Pause starts
-                in_pause = True
-                pause_start = t
-            elif not p and in_pause:
-                # Pause ends
-                in_pause = False
-                pause_duration = t - pause_start
-                if pause_duration >= self.min_pause_duration:
-                    pauses.append(PauseInfo(
-                        start=pause_start,
-                        end=t,
-                        duration=pause_duration,
-                    ))
-
-        # Handle pause at end
-        if in_pause:
-            pause_duration = frame_times[-1] - pause_start
-            if pause_duration >= self.min_pause_duration:
-                pauses.append(PauseInfo(
-                    start=pause_start,
-                    end=frame_times[-1],
-                    duration=pause_duration,
-                ))
-
-        return pauses
-
-    def _estimate_speech_rate(self, audio: np.ndarray, sr: int) -> float | None:
+        return rms_db, frame_times
+
+    def _extract_volume(self, rms_db: np.ndarray) -> dict:
+        """Extract volume/intensity features from frame energy."""
+        # Filter out very quiet frames for statistics
+        count, mean, std, _, _ = _stats_above(rms_db, -60.0)
+        _, all_mean, all_std, vmin, vmax = _stats_above(rms_db, -np.finfo(np.float64).max)
+        if count == 0:
+            mean, std = all_mean, all_std
+
+        return {
+            "mean": mean,
+            "std": std,
+            "min": vmin,
+            "max": vmax,
+        }
+
+    def _detect_pauses(
+        self,
+        rms_db: np.ndarray,
+        frame_times: np.ndarray,
+    ) -> list[PauseInfo]:
+        """Detect pauses based on a frame energy threshold."""
+        # Find frames below threshold
+        is_pause = rms_db < self.pause_threshold_db
+
+        # Find pause boundaries: padding with non-pause frames makes every
+        # run of pause frames produce exactly one rising and one falling edge
+        edges = np.flatnonzero(np.diff(np.r_[False, is_pause, False].astype(np.int8)))
+        starts, ends = edges[0::2], edges[1::2]
+
+        # A pause ends at the first non-pause frame (or the last frame)
+        start_times = frame_times[starts]
+        end_times = frame_times[np.minimum(ends, len(frame_times) - 1)]
+        durations = end_times - start_times
+
+        keep = durations >= self.min_pause_duration
+        return [
+            PauseInfo.model_construct(start=start, end=end, duration=duration)
+            for start, end, duration in zip(
+                start_times[keep].tolist(),
+                end_times[keep].tolist(),
+                durations[keep].tolist(),
+            )
+        ]
+
+    def _estimate_speech_rate(
+        self,
+        rms_db: np.ndarray,
+        hop_s: float,
+        duration: float,
+    ) -> float | None:
         """Estimate speech rate in syllables per second.
 
-        Uses onset detection as a proxy for syllable nuclei.
+        Uses energy onsets as a proxy for syllable nuclei.
         """
+        if duration <= 0:
+            return None
+
         try:
             # Detect onsets (approximates syllable nuclei)
-            onset_env = librosa.onset.onset_strength(y=audio, sr=sr)
-            onsets = librosa.onset.onset_detect(
-                onset_envelope=onset_env,
-                sr=sr,
-                units="time",
+            syllable_count = _count_onsets(
+                np.ascontiguousarray(rms_db, dtype=np.float64),
+                hop_s,
+                MIN_ONSET_INTERVAL,
+                self.pause_threshold_db,
             )
 
-            duration = len(audio) / sr
-
-            if duration <= 0:
-                return None
-
             # Syllables per second
             # This is a rough estimate - true syllable detection requires more
             # sophisticated analysis
-            syllable_count = len(onsets)
-            return syllable_count / duration if duration > 0 else None
+            return syllable_count / duration
 
         except Exception as e:
             logger.warning(f"Speech rate estimation failed: {e}")
@@ -0,0 +1,58 @@
+"""Process-wide cache of analysis results."""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from src.config import settings
+from src.schemas import ContourFormat, InflectionResult
+
+# Hashed request + file version -> result
+_cache: OrderedDict[bytes, InflectionResult] = OrderedDict()
+_lock = threading.Lock()
+
+
+def result_key(
+    audio_path: str | Path,
+    start_time: float | None,
+    end_time: float | None,
+    contour_format: ContourFormat,
+) -> bytes:
+    """Key an analysis by file version, time bounds and the settings it depends on."""
+    path = Path(audio_path)
+    # The modification time is part of the key so a rewritten file misses
+    parts = (
+        str(path.resolve()),
+        path.stat().st_mtime_ns,
+        start_time,
+        end_time,
+        contour_format,
+        settings.analysis_sample_rate,
+        settings.pitch_method,
+        settings.pitch_floor_hz,
+        settings.pitch_ceiling_hz,
+        settings.pause_threshold_db,
+        settings.min_pause_duration,
+        settings.model_name,
+        settings.min_confidence,
+    )
+    return hashlib.blake2b(repr(parts).encode(), digest_size=8).digest()
+
+
+def get_result(key: bytes) -> InflectionResult | None:
+    """Get a previously computed result, or None if it is not cached."""
+    with _lock:
+        result = _cache.get(key)
+        if result is not None:
+            _cache.move_to_end(key)
+        return result
+
+
+def put_result(key: bytes, result: InflectionResult) -> None:
+    """Cache a result, evicting the least recently used beyond the size limit."""
+    with _lock:
+        _cache[key] = result
+        _cache.move_to_end(key)
+        while len(_cache) > settings.result_cache_size:
+            _cache.popitem(last=False)
@@ -1,19 +1,47 @@
 """Request and response schemas."""
 
-from pydantic import BaseModel, Field
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, Field
+
+# Result models are built by the analyzers from trusted, already-typed values
+# via model_construct(), skipping per-field validation; freezing them keeps
+# those instances from being modified after construction.
+RESULT_CONFIG = ConfigDict(frozen=True, extra="forbid")
 
 
 class PauseInfo(BaseModel):
     """Information about a detected pause."""
 
+    model_config = RESULT_CONFIG
+
     start: float = Field(description="Start time in seconds")
     end: float = Field(description="End time in seconds")
     duration: float = Field(description="Duration in seconds")
 
 
+class PitchContourBinary(BaseModel):
+    """Pitch contour packed as base64-encoded little-endian float32 arrays."""
+
+    model_config = RESULT_CONFIG
+
+    encoding: Literal["base64-f32"] = Field(
+        default="base64-f32",
+        description="Encoding of the times and freqs arrays"
+    )
+    times: str = Field(description="Frame times in seconds")
+    freqs: str = Field(description="Pitch per frame in Hz")
+    count: int = Field(description="Number of points in each array")
+
+
+ContourFormat = Literal["json", "binary"]
+
+
 class ProsodyResult(BaseModel):
     """Prosodic analysis results."""
 
+    model_config = RESULT_CONFIG
+
     # Pitch (F0) statistics
     pitch_mean_hz: float | None = Field(description="Mean pitch in Hz")
     pitch_std_hz: float | None = Field(description="Pitch standard deviation in Hz")
@@ -23,6 +51,10 @@ class ProsodyResult(BaseModel):
         default_factory=list,
         description="Pitch contour as [[time, pitch], ...]"
     )
+    pitch_contour_binary: PitchContourBinary | None = Field(
+        default=None,
+        description="Pitch contour in binary form (contour_format='binary' only)"
+    )
 
     # Speech rate
     speech_rate_syllables_per_sec: float | None = Field(
@@ -52,6 +84,8 @@ class ProsodyResult(BaseModel):
 class EmotionDistribution(BaseModel):
     """Distribution of emotion probabilities."""
 
+    model_config = RESULT_CONFIG
+
     happy: float = Field(ge=0, le=1)
     sad: float = Field(ge=0, le=1)
     angry: float = Field(ge=0, le=1)
@@ -63,6 +97,8 @@ class EmotionDistribution(BaseModel):
 class EmotionResult(BaseModel):
     """Emotion detection results."""
 
+    model_config = RESULT_CONFIG
+
     primary: str = Field(description="Primary detected emotion")
     confidence: float = Field(ge=0, le=1, description="Confidence score")
     distribution: EmotionDistribution = Field(
@@ -76,6 +112,8 @@ class EmotionResult(BaseModel):
 class SegmentInfo(BaseModel):
     """Information about the analyzed segment."""
 
+    model_config = RESULT_CONFIG
+
     start: float = Field(description="Start time in seconds")
     end: float = Field(description="End time in seconds")
     duration: float = Field(description="Duration in seconds")
@@ -101,6 +139,10 @@ class AnalyzeRequest(BaseModel):
         default=None,
         description="End time in seconds (optional)"
     )
+    contour_format: ContourFormat = Field(
+        default="json",
+        description="Pitch contour format: 'json' pairs or compact 'binary'"
+    )
 
 
 class BatchSegment(BaseModel):
@@ -116,6 +158,10 @@ class BatchAnalyzeRequest(BaseModel):
 
     audio_path: str = Field(description="Path to audio file")
     segments: list[BatchSegment] = Field(description="Segments to analyze")
+    contour_format: ContourFormat = Field(
+        default="json",
+        description="Pitch contour format: 'json' pairs or compact 'binary'"
+    )
 
 
 class BatchSegmentResult(BaseModel):
@@ -1,12 +1,13 @@
 """Real-time transcription service with WebSocket support."""
 
-import json
 import logging
 import os
 from contextlib import asynccontextmanager
 
+import numpy as np
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from pydantic import ValidationError
 
 from src.config import settings
 from src.schemas import (
@@ -14,10 +15,12 @@ from src.schemas import (
     ErrorMessage,
     HealthResponse,
     ModelSize,
+    PingMessage,
     StatusMessage,
+    client_message_adapter,
 )
-from src.session import session_manager
-from src.transcriber import transcriber
+from src.session import pcm16_to_float32, session_manager
+from src.transcriber import transcriber, transcriber_executor
 
 # Configure logging
 logging.basicConfig(
@@ -33,11 +36,15 @@ async def lifespan(app: FastAPI):
     logger.info(f"Starting {settings.service_name}")
     logger.info(f"Device: {transcriber.device}")
 
+    # Compile the PCM conversion kernel now rather than on the first window
+    pcm16_to_float32(np.zeros(1, dtype=np.int16), np.empty(1, dtype=np.float32))
+
     # Optionally preload model
     if os.environ.get("PRELOAD_MODEL", "").lower() == "true":
         try:
             transcriber.load_model(ModelSize(settings.default_model))
             transcriber.load_vad()
+            transcriber.warmup()
         except Exception as e:
             logger.warning(f"Failed to preload models: {e}")
 
@@ -93,11 +100,11 @@ async def websocket_transcribe(websocket: WebSocket):
         session = await session_manager.create_session(websocket)
 
         # Send session created message
-        await websocket.send_json(
+        await websocket.send_text(
             StatusMessage(
                 status="connected",
                 session_id=session.session_id,
-            ).model_dump()
+            ).model_dump_json()
         )
 
         # Process messages
@@ -115,23 +122,27 @@ async def websocket_transcribe(websocket: WebSocket):
                 elif "text" in message:
                     # JSON message (config, etc.)
                     try:
-                        data = json.loads(message["text"])
-                        msg_type = data.get("type", "")
-
-                        if msg_type == "config":
-                            config = ConfigMessage(**data)
-                            await session_manager.configure_session(session, config)
-
-                        elif msg_type == "ping":
-                            await websocket.send_json({"type": "pong"})
-
-                    except json.JSONDecodeError:
-                        await websocket.send_json(
-                            ErrorMessage(
-                                error="invalid_json",
-                                detail="Could not parse JSON message",
-                            ).model_dump()
-                        )
+                        data = client_message_adapter.validate_json(message["text"])
+                    except ValidationError as e:
+                        error_types = {error["type"] for error in e.errors()}
+                        if "json_invalid" in error_types:
+                            await websocket.send_text(
+                                ErrorMessage(
+                                    error="invalid_json",
+                                    detail="Could not parse JSON message",
+                                ).model_dump_json()
+                            )
+                            continue
+                        # Messages of unknown type are ignored
+                        if error_types <= {"union_tag_invalid", "union_tag_not_found"}:
+                            continue
+                        raise
+
+                    if isinstance(data, ConfigMessage):
+                        await session_manager.configure_session(session, data)
+
+                    elif isinstance(data, PingMessage):
+                        await websocket.send_json({"type": "pong"})
 
             except WebSocketDisconnect:
                 break
@@ -139,8 +150,8 @@ async def websocket_transcribe(websocket: WebSocket):
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
         try:
-            await websocket.send_json(
-                ErrorMessage(error="internal_error", detail=str(e)).model_dump()
+            await websocket.send_text(
+                ErrorMessage(error="internal_error", detail=str(e)).model_dump_json()
             )
         except Exception:
             pass
@@ -165,8 +176,8 @@ async def load_model(model_id: ModelSize) -> dict:
     try:
         import asyncio
 
-        await asyncio.get_event_loop().run_in_executor(
-            None,
+        await asyncio.get_running_loop().run_in_executor(
+            transcriber_executor,
             lambda: transcriber.load_model(model_id),
         )
         return {"status": "loaded", "model": model_id.value}
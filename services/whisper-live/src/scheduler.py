@@ -0,0 +1,86 @@
+"""Cross-session batching of transcription requests."""
+
+import asyncio
+import functools
+import logging
+
+import numpy as np
+
+from src.config import settings
+from src.schemas import FinalResult, PartialResult
+from src.transcriber import transcriber, transcriber_executor
+
+logger = logging.getLogger(__name__)
+
+BatchItem = tuple[np.ndarray, str | None, asyncio.Future]
+
+
+class BatchScheduler:
+    """Coalesces audio windows from concurrent sessions into batched passes.
+
+    Windows that arrive within batch_window_ms of each other (up to
+    max_batch_size) are transcribed together, one batch at a time.
+    """
+
+    def __init__(self) -> None:
+        self._queue: asyncio.Queue[BatchItem] | None = None
+        self._task: asyncio.Task | None = None
+
+    async def submit(
+        self,
+        audio: np.ndarray,
+        language: str | None,
+    ) -> list[PartialResult | FinalResult]:
+        """Queue a window for transcription and wait for its results."""
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._dispatch())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((audio, language, future))
+        return await future
+
+    async def _dispatch(self) -> None:
+        """Collect and run batches until cancelled."""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + settings.batch_window_ms / 1000
+            while len(batch) < settings.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Language is fixed per pass, so only like sessions share one
+            groups: dict[str | None, list[BatchItem]] = {}
+            for item in batch:
+                groups.setdefault(item[1], []).append(item)
+
+            for language, items in groups.items():
+                try:
+                    results = await loop.run_in_executor(
+                        transcriber_executor,
+                        functools.partial(
+                            transcriber.transcribe_batch,
+                            [audio for audio, _, _ in items],
+                            language=language,
+                        ),
+                    )
+                except Exception as e:
+                    logger.error(f"Batched transcription of {len(items)} windows failed: {e}")
+                    for _, _, future in items:
+                        if not future.done():
+                            future.set_exception(e)
+                else:
+                    for (_, _, future), result in zip(items, results):
+                        if not future.done():
+                            future.set_result(result)
+
+
+# Global scheduler
+batch_scheduler = BatchScheduler()
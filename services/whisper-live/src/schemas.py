@@ -1,9 +1,9 @@
 """API schemas for real-time transcription."""
 
 from enum import Enum
-from typing import Any
+from typing import Annotated, Any, Literal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, TypeAdapter
 
 
 class MessageType(str, Enum):
@@ -29,13 +29,24 @@ class ModelSize(str, Enum):
 class ConfigMessage(BaseModel):
     """Session configuration message."""
 
-    type: str = "config"
+    type: Literal["config"] = "config"
     model: ModelSize = ModelSize.SMALL
     language: str | None = None
     vad_enabled: bool = True
     beam_size: int = 5
 
 
+class PingMessage(BaseModel):
+    """Keepalive message, answered with a pong."""
+
+    type: Literal["ping"] = "ping"
+
+
+# Text frames are parsed and validated in one step, selecting the model by type
+ClientMessage = Annotated[ConfigMessage | PingMessage, Field(discriminator="type")]
+client_message_adapter = TypeAdapter(ClientMessage)
+
+
 class WordTimestamp(BaseModel):
     """Word with timestamp."""
 
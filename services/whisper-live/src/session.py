@@ -2,22 +2,35 @@
 
 import asyncio
 import logging
+import time
 import uuid
+from collections import deque
 from collections.abc import Callable
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any
 
 import numpy as np
+import webrtcvad
 from fastapi import WebSocket
+from numba import njit
 
 from src.config import settings
 from src.schemas import ConfigMessage, ErrorMessage, FinalResult, ModelSize, PartialResult, StatusMessage
-from src.transcriber import transcriber
+from src.scheduler import batch_scheduler
+from src.transcriber import transcriber, transcriber_executor
 
 logger = logging.getLogger(__name__)
 
 
+@njit(cache=True, fastmath=True, boundscheck=False)
+def pcm16_to_float32(src: np.ndarray, dst: np.ndarray) -> None:
+    """Widen and scale 16-bit PCM into dst in a single vectorized pass."""
+    scale = np.float32(1.0 / 32768.0)
+    for i in range(src.shape[0]):
+        dst[i] = src[i] * scale
+
+
 @dataclass
 class TranscriptionSession:
     """A real-time transcription session."""
@@ -28,13 +41,30 @@ class TranscriptionSession:
     language: str | None = None
     vad_enabled: bool = True
     created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
-    last_activity: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
-    audio_buffer: bytearray = field(default_factory=bytearray)
+    # time.monotonic() of the last audio chunk; cheap enough to update per chunk
+    last_activity: float = field(default_factory=time.monotonic)
+    # Incoming chunks, joined only when a window is consumed
+    audio_buffer: deque[bytes] = field(default_factory=deque)
+    buffered_bytes: int = 0
+    # Reused float32 window, sized for 30 s so it rarely needs to grow
+    audio_f32: np.ndarray = field(
+        default_factory=lambda: np.empty(settings.sample_rate * 30, dtype=np.float32)
+    )
+    # Per-frame speech gate state
+    vad: webrtcvad.Vad = field(default_factory=lambda: webrtcvad.Vad(settings.vad_aggressiveness))
+    vad_remainder: bytes = b""
+    in_speech: bool = False
+    silence_ms: int = 0
+    preroll: deque[bytes] = field(
+        default_factory=lambda: deque(maxlen=settings.vad_padding_ms // settings.chunk_duration_ms)
+    )
+    # Model load started when the connection was accepted, if one was needed
+    model_load: asyncio.Task | None = None
     is_active: bool = True
 
     def update_activity(self) -> None:
         """Update last activity timestamp."""
-        self.last_activity = datetime.now(timezone.utc)
+        self.last_activity = time.monotonic()
 
 
 class SessionManager:
@@ -43,6 +73,8 @@ class SessionManager:
     def __init__(self) -> None:
         self._sessions: dict[str, TranscriptionSession] = {}
         self._lock = asyncio.Lock()
+        # Shared by sessions that connect while the default model is loading
+        self._model_load: asyncio.Task | None = None
 
     @property
     def active_sessions(self) -> int:
@@ -59,12 +91,38 @@ class SessionManager:
             session = TranscriptionSession(
                 session_id=session_id,
                 websocket=websocket,
+                model_load=self._start_model_load(),
             )
             self._sessions[session_id] = session
 
             logger.info(f"Created session {session_id}")
             return session
 
+    def _start_model_load(self) -> asyncio.Task | None:
+        """Start loading the default model in the background if it is not loaded.
+
+        This overlaps a cold load with the handshake and the client's config
+        message instead of starting it only once the session is configured.
+        """
+        if transcriber.model_loaded:
+            return None
+
+        if self._model_load is None or self._model_load.done():
+            model_size = ModelSize(settings.default_model)
+
+            async def load() -> None:
+                try:
+                    await asyncio.get_running_loop().run_in_executor(
+                        transcriber_executor,
+                        lambda: transcriber.load_model(model_size),
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to preload model {model_size.value}: {e}")
+
+            self._model_load = asyncio.create_task(load())
+
+        return self._model_load
+
     async def get_session(self, session_id: str) -> TranscriptionSession | None:
         """Get a session by ID."""
         return self._sessions.get(session_id)
@@ -86,29 +144,81 @@ class SessionManager:
         """Process incoming audio data."""
         session.update_activity()
 
-        # Add to buffer
-        session.audio_buffer.extend(audio_data)
+        if session.vad_enabled:
+            await self._gate_audio(session, audio_data)
+        else:
+            self._buffer_audio(session, audio_data)
 
-        # Process when we have enough audio (roughly 1 second)
+        # Coalesce incoming chunks into one window per VAD + transcription pass
         bytes_per_second = settings.sample_rate * 2  # 16-bit audio
-        min_buffer_size = bytes_per_second
+        min_buffer_size = bytes_per_second * settings.vad_window_ms // 1000
 
-        if len(session.audio_buffer) >= min_buffer_size:
+        if session.buffered_bytes >= min_buffer_size:
             await self._process_buffer(session)
 
+    def _buffer_audio(self, session: TranscriptionSession, audio_data: bytes) -> None:
+        """Append audio to the session's buffer."""
+        session.audio_buffer.append(audio_data)
+        session.buffered_bytes += len(audio_data)
+
+    async def _gate_audio(self, session: TranscriptionSession, audio_data: bytes) -> None:
+        """Buffer only speech, checking each frame as it arrives.
+
+        Silence never reaches the recognizer, and an utterance is transcribed
+        as soon as it ends instead of when the window fills.
+        """
+        frame_bytes = settings.sample_rate * 2 * settings.chunk_duration_ms // 1000
+
+        data = session.vad_remainder + audio_data
+        end = len(data) - len(data) % frame_bytes
+        session.vad_remainder = data[end:]
+
+        for offset in range(0, end, frame_bytes):
+            frame = data[offset:offset + frame_bytes]
+
+            if session.vad.is_speech(frame, settings.sample_rate):
+                if not session.in_speech:
+                    session.in_speech = True
+                    # Keep the audio just before speech so onsets are not clipped
+                    for preroll_frame in session.preroll:
+                        self._buffer_audio(session, preroll_frame)
+                    session.preroll.clear()
+                session.silence_ms = 0
+                self._buffer_audio(session, frame)
+
+            elif session.in_speech:
+                self._buffer_audio(session, frame)
+                session.silence_ms += settings.chunk_duration_ms
+                if session.silence_ms >= settings.vad_silence_ms:
+                    # End of utterance: transcribe it now
+                    session.in_speech = False
+                    await self._process_buffer(session)
+
+            else:
+                session.preroll.append(frame)
+
     async def _process_buffer(self, session: TranscriptionSession) -> None:
         """Process the audio buffer."""
-        if not session.audio_buffer:
+        # Whole samples only; a trailing odd byte waits for the next chunk
+        n = session.buffered_bytes // 2
+        if n == 0:
             return
 
-        # Convert bytes to numpy array
-        audio_bytes = bytes(session.audio_buffer)
-        audio = np.frombuffer(audio_bytes, dtype=np.int16).astype(np.float32) / 32768.0
-
-        # Clear buffer
+        # Stitch the chunks together once
+        data = b"".join(session.audio_buffer)
         session.audio_buffer.clear()
+        if len(data) > n * 2:
+            session.audio_buffer.append(data[n * 2:])
+        session.buffered_bytes = len(data) - n * 2
+
+        if n > len(session.audio_f32):
+            session.audio_f32 = np.empty(n, dtype=np.float32)
 
-        # Run VAD if enabled
+        # Widen and scale in one pass into the session's reusable buffer
+        audio = session.audio_f32[:n]
+        pcm16_to_float32(np.frombuffer(data, dtype=np.int16, count=n), audio)
+
+        # Confirm gated audio with Silero, which is more robust to noise
         if session.vad_enabled:
             segments = transcriber.detect_voice_activity(audio)
             if not segments:
@@ -117,24 +227,36 @@ class SessionManager:
 
         # Transcribe
         try:
-            loop = asyncio.get_event_loop()
+            # Batched chunks are capped at Whisper's 30 s input
+            if settings.max_batch_size > 1 and n <= settings.sample_rate * 30:
+                # Share a batched pass with other sessions' windows
+                results = await batch_scheduler.submit(audio, session.language)
+                for result in results:
+                    await session.websocket.send_text(result.model_dump_json())
+                return
 
-            async def transcribe_and_send():
+            loop = asyncio.get_running_loop()
+
+            def transcribe_and_send() -> None:
+                # Decoding runs on a worker thread; each result is sent on the
+                # event loop as soon as it is ready, so partials stream out
                 for result in transcriber.transcribe_segment(
                     audio,
                     language=session.language,
                 ):
-                    if isinstance(result, PartialResult):
-                        await session.websocket.send_json(result.model_dump())
-                    elif isinstance(result, FinalResult):
-                        await session.websocket.send_json(result.model_dump())
+                    if isinstance(result, (PartialResult, FinalResult)):
+                        # Wait for the send to keep results ordered
+                        asyncio.run_coroutine_threadsafe(
+                            session.websocket.send_text(result.model_dump_json()),
+                            loop,
+                        ).result()
 
-            await loop.run_in_executor(None, lambda: asyncio.run(transcribe_and_send()))
+            await loop.run_in_executor(transcriber_executor, transcribe_and_send)
 
         except Exception as e:
             logger.error(f"Transcription error in session {session.session_id}: {e}")
-            await session.websocket.send_json(
-                ErrorMessage(error="transcription_failed", detail=str(e)).model_dump()
+            await session.websocket.send_text(
+                ErrorMessage(error="transcription_failed", detail=str(e)).model_dump_json()
             )
 
     async def configure_session(
@@ -147,18 +269,23 @@ class SessionManager:
         session.language = config.language
         session.vad_enabled = config.vad_enabled
 
+        # Let an eager load finish first so two loads never race
+        if session.model_load is not None:
+            await session.model_load
+            session.model_load = None
+
         # Ensure model is loaded
         if not transcriber.model_loaded or transcriber._model_size != config.model:
-            await asyncio.get_event_loop().run_in_executor(
-                None,
+            await asyncio.get_running_loop().run_in_executor(
+                transcriber_executor,
                 lambda: transcriber.load_model(config.model),
             )
 
-        await session.websocket.send_json(
+        await session.websocket.send_text(
             StatusMessage(
                 status="configured",
                 session_id=session.session_id,
-            ).model_dump()
+            ).model_dump_json()
         )
 
 
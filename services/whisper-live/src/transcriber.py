@@ -2,11 +2,13 @@
 
 import logging
 import os
-from collections.abc import Generator
+from collections.abc import Generator, Iterable
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import numpy as np
 import torch
+from cpu_tuning import cpu_compute_type, physical_cores
 
 from src.config import settings
 from src.schemas import FinalResult, ModelSize, PartialResult, WordTimestamp
@@ -19,10 +21,11 @@ class RealtimeTranscriber:
 
     def __init__(self) -> None:
         self._model = None
+        self._batched_pipeline = None
         self._model_size: ModelSize | None = None
         self._device: str = self._detect_device()
-        self._compute_type: str = self._get_compute_type()
         self._vad_model = None
+        self._get_speech_timestamps = None
 
         os.makedirs(settings.model_cache_dir, exist_ok=True)
 
@@ -36,15 +39,31 @@ class RealtimeTranscriber:
         else:
             return "cpu"
 
-    def _get_compute_type(self) -> str:
-        """Get compute type based on device."""
+    def _get_compute_type(self, model_size: ModelSize) -> str:
+        """Get compute type based on device and model size."""
         if settings.compute_type != "auto":
             return settings.compute_type
 
         if self._device == "cuda":
-            return "float16"
+            # int8 weights with fp16 activations halve weight bandwidth for the
+            # memory-bound decoder; tiny/base are too small to benefit
+            if model_size in (ModelSize.TINY, ModelSize.BASE):
+                return "float16"
+            return "int8_float16"
         else:
-            return "int8"
+            return cpu_compute_type()
+
+    def _get_parallelism(self) -> tuple[int, int]:
+        """Get the (num_workers, cpu_threads) to load models with.
+
+        Each worker is an independent decoding context, so concurrent
+        transcriptions overlap instead of queueing on a single model.
+        """
+        num_workers = settings.num_workers or (2 if self._device == "cuda" else 1)
+        cpu_threads = settings.cpu_threads
+        if not cpu_threads and self._device == "cpu":
+            cpu_threads = physical_cores()
+        return num_workers, cpu_threads
 
     @property
     def device(self) -> str:
@@ -66,11 +85,19 @@ class RealtimeTranscriber:
         try:
             from faster_whisper import WhisperModel
 
+            # Release the previous model first so both never sit in VRAM at once
+            self._model = None
+            self._batched_pipeline = None
+            self._model_size = None
+
+            num_workers, cpu_threads = self._get_parallelism()
             self._model = WhisperModel(
                 model_size.value,
                 device=self._device,
-                compute_type=self._compute_type,
+                compute_type=self._get_compute_type(model_size),
                 download_root=settings.model_cache_dir,
+                num_workers=num_workers,
+                cpu_threads=cpu_threads,
             )
             self._model_size = model_size
             logger.info(f"Model {model_size.value} loaded")
@@ -86,15 +113,47 @@ class RealtimeTranscriber:
 
         try:
             # Use Silero VAD
-            self._vad_model, _ = torch.hub.load(
+            vad_model, utils = torch.hub.load(
                 repo_or_dir="snakers4/silero-vad",
                 model="silero_vad",
                 force_reload=False,
             )
+            # get_speech_timestamps is a returned helper, not a model method
+            self._get_speech_timestamps = utils[0]
+
+            # VAD stays on the CPU: it is tiny, and on the GPU every window
+            # would pay a host/device round trip just to gate transcription
+            if settings.vad_quantize:
+                try:
+                    vad_model = torch.ao.quantization.quantize_dynamic(
+                        vad_model,
+                        {torch.nn.Linear, torch.nn.LSTM},
+                        dtype=torch.qint8,
+                    )
+                except Exception as e:
+                    # The TorchScript build of Silero cannot be quantized
+                    logger.info(f"VAD model not quantized: {e}")
+
+            self._vad_model = vad_model
             logger.info("VAD model loaded")
         except Exception as e:
             logger.warning(f"Failed to load VAD model: {e}")
 
+    def warmup(self) -> None:
+        """Run the loaded models once on silence.
+
+        The first pass pays for CUDA kernel selection and buffer allocation;
+        doing it at startup keeps that off the first session's latency.
+        """
+        silence = np.zeros(settings.sample_rate, dtype=np.float32)
+        if self._vad_model is not None:
+            self.detect_voice_activity(silence)
+        if self._model is not None:
+            # Results are generated lazily; consume them to actually decode
+            for _ in self.transcribe_segment(silence):
+                pass
+        logger.info("Models warmed up")
+
     def detect_voice_activity(
         self,
         audio: np.ndarray,
@@ -111,15 +170,17 @@ class RealtimeTranscriber:
             # No VAD available, return entire audio
             return [(0.0, len(audio) / settings.sample_rate)]
 
-        # Convert to torch tensor
-        audio_tensor = torch.from_numpy(audio).float()
+        # Wrap the float32 samples without copying
+        audio_tensor = torch.from_numpy(np.ascontiguousarray(audio, dtype=np.float32))
 
         # Get speech timestamps
-        speech_timestamps = self._vad_model.get_speech_timestamps(
-            audio_tensor,
-            sampling_rate=settings.sample_rate,
-            threshold=threshold,
-        )
+        with torch.inference_mode():
+            speech_timestamps = self._get_speech_timestamps(
+                audio_tensor,
+                self._vad_model,
+                sampling_rate=settings.sample_rate,
+                threshold=threshold,
+            )
 
         # Convert to seconds
         segments = []
@@ -134,7 +195,7 @@ class RealtimeTranscriber:
         self,
         audio: np.ndarray,
         language: str | None = None,
-        beam_size: int = 5,
+        beam_size: int | None = None,
     ) -> Generator[PartialResult | FinalResult, None, None]:
         """Transcribe an audio segment with streaming results.
 
@@ -153,53 +214,136 @@ class RealtimeTranscriber:
             segments, info = self._model.transcribe(
                 audio,
                 language=language,
-                beam_size=beam_size,
+                beam_size=beam_size or settings.beam_size,
+                best_of=settings.best_of,
+                temperature=0.0,
+                # Windows are independent; carrying text over lets errors compound
+                condition_on_previous_text=False,
                 word_timestamps=True,
                 vad_filter=False,  # We handle VAD ourselves
             )
 
-            detected_language = info.language
-            current_text = ""
-            segment_start = 0.0
-            all_words: list[WordTimestamp] = []
+            yield from self._results(segments, info.language)
 
-            for segment in segments:
-                # Yield partial result as we process
-                current_text += segment.text
-                yield PartialResult(
-                    text=current_text.strip(),
-                    timestamp=segment.end,
-                )
-
-                # Collect words
-                if segment.words:
-                    for word in segment.words:
-                        all_words.append(
-                            WordTimestamp(
-                                word=word.word,
-                                start=word.start,
-                                end=word.end,
-                                probability=word.probability,
-                            )
-                        )
+        except Exception as e:
+            logger.error(f"Transcription error: {e}")
+            raise
+
+    def transcribe_batch(
+        self,
+        clips: list[np.ndarray],
+        language: str | None = None,
+        beam_size: int | None = None,
+    ) -> list[list[PartialResult | FinalResult]]:
+        """Transcribe several clips (each under 30 s) in one batched pass.
+
+        The clips are laid end to end and handed to faster-whisper's batched
+        pipeline as separate chunks, so they are encoded and decoded together.
+
+        Returns each clip's results as transcribe_segment would yield them.
+        """
+        if self._model is None:
+            raise RuntimeError("Model not loaded")
 
-                segment_start = min(segment_start, segment.start) if segment_start else segment.start
+        if self._batched_pipeline is None:
+            from faster_whisper import BatchedInferencePipeline
 
-            # Yield final result
-            if current_text.strip():
-                segment_end = all_words[-1].end if all_words else 0.0
-                yield FinalResult(
-                    text=current_text.strip(),
-                    start=segment_start,
-                    end=segment_end,
-                    language=detected_language,
-                    words=all_words,
-                )
+            self._batched_pipeline = BatchedInferencePipeline(model=self._model)
+
+        offsets = np.cumsum([0] + [len(clip) for clip in clips])
+        clip_timestamps = [
+            {"start": int(start), "end": int(end)}
+            for start, end in zip(offsets[:-1], offsets[1:])
+        ]
+
+        try:
+            segments, info = self._batched_pipeline.transcribe(
+                np.concatenate(clips),
+                language=language,
+                beam_size=beam_size or settings.beam_size,
+                best_of=settings.best_of,
+                temperature=0.0,
+                word_timestamps=True,
+                vad_filter=False,  # We handle VAD ourselves
+                clip_timestamps=clip_timestamps,
+                batch_size=len(clips),
+            )
+
+            # Segments never span chunks; assign each to the clip it starts in
+            clip_ends = offsets[1:] / settings.sample_rate
+            clip_segments: list[list] = [[] for _ in clips]
+            for segment in segments:
+                index = int(np.searchsorted(clip_ends, segment.start, side="right"))
+                clip_segments[min(index, len(clips) - 1)].append(segment)
+
+            return [
+                list(self._results(segs, info.language, offset / settings.sample_rate))
+                for segs, offset in zip(clip_segments, offsets[:-1])
+            ]
 
         except Exception as e:
-            logger.error(f"Transcription error: {e}")
+            logger.error(f"Batched transcription error: {e}")
             raise
 
+    def _results(
+        self,
+        segments: Iterable,
+        detected_language: str,
+        offset: float = 0.0,
+    ) -> Generator[PartialResult | FinalResult, None, None]:
+        """Turn faster-whisper segments into partial results and a final result.
+
+        Times are shifted back by offset seconds. Results are built with
+        model_construct: every field comes from the decoder already typed, so
+        per-word validation would only add overhead on the hot path.
+        """
+        # Segment texts, joined when a result is sent rather than re-concatenated
+        texts: list[str] = []
+        segment_start = 0.0
+        all_words: list[WordTimestamp] = []
+
+        for segment in segments:
+            # Yield partial result as we process
+            texts.append(segment.text)
+            yield PartialResult.model_construct(
+                text="".join(texts).strip(),
+                timestamp=segment.end - offset,
+            )
+
+            # Collect words
+            if segment.words:
+                for word in segment.words:
+                    all_words.append(
+                        WordTimestamp.model_construct(
+                            word=word.word,
+                            start=word.start - offset,
+                            end=word.end - offset,
+                            probability=word.probability,
+                        )
+                    )
+
+            start = segment.start - offset
+            segment_start = min(segment_start, start) if segment_start else start
+
+        # Yield final result
+        text = "".join(texts).strip()
+        if text:
+            segment_end = all_words[-1].end if all_words else 0.0
+            yield FinalResult.model_construct(
+                text=text,
+                start=segment_start,
+                end=segment_end,
+                language=detected_language,
+                words=all_words,
+            )
+
 
 # Global instance
 transcriber = RealtimeTranscriber()
+
+# Model work gets one thread per decoding context: callers queue here instead
+# of oversubscribing the device from the default pool's many threads
+transcriber_executor = ThreadPoolExecutor(
+    max_workers=transcriber._get_parallelism()[0],
+    thread_name_prefix="whisper",
+)
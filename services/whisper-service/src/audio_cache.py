@@ -0,0 +1,55 @@
+"""Process-wide cache of decoded audio files."""
+
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+from src.config import settings
+
+SAMPLE_RATE = 16000  # Whisper's input rate
+
+# SHA-256 of the file's bytes -> read-only mono 16 kHz audio
+_cache: OrderedDict[str, np.ndarray] = OrderedDict()
+_cache_bytes = 0
+_lock = threading.Lock()
+
+
+def get_audio(path: Path, content_hash: str | None = None) -> np.ndarray:
+    """Get a whole file as mono 16 kHz float32 audio.
+
+    Uploads are saved under fresh names, so decoded audio is cached by
+    content_hash (the SHA-256 of the file's bytes) rather than by path; a
+    re-upload of the same file then skips decoding. Without a hash the file
+    is simply decoded.
+
+    The returned array is read-only and shared; copy before modifying.
+    """
+    global _cache_bytes
+
+    key = content_hash
+    if key is not None:
+        with _lock:
+            audio = _cache.get(key)
+            if audio is not None:
+                _cache.move_to_end(key)
+                return audio
+
+    from faster_whisper import decode_audio
+
+    audio = decode_audio(str(path), sampling_rate=SAMPLE_RATE)
+    audio.flags.writeable = False
+    if key is None or audio.nbytes > settings.audio_cache_bytes:
+        return audio
+
+    with _lock:
+        if key not in _cache:
+            _cache[key] = audio
+            _cache_bytes += audio.nbytes
+        # Evict least recently used files until under the byte budget
+        while _cache_bytes > settings.audio_cache_bytes:
+            _, evicted = _cache.popitem(last=False)
+            _cache_bytes -= evicted.nbytes
+
+    return audio
@@ -16,17 +16,30 @@ class Settings(BaseSettings):
     default_model: str = "small"
     model_cache_dir: str = "/app/models"
     device: str = "auto"  # auto, cuda, cpu
-    compute_type: str = "auto"  # auto, float16, int8, float32
+    compute_type: str = "auto"  # auto, float16, int8_float16, int8, float32
+    weight_only_int8: bool = True  # auto on CUDA: int8 weights with fp16 activations
+    num_workers: int = 0  # Parallel decoding contexts; 0 = auto (2 on CUDA, 1 on CPU)
+    cpu_threads: int = 0  # Threads per worker on CPU; 0 = auto (one per physical core)
 
     # Transcription defaults
     default_language: str | None = None  # None = auto-detect
     default_batch_size: int = 16
-    default_beam_size: int = 5
+    default_beam_size: int = 5  # On CUDA; CPU decodes greedily unless a beam is requested
 
     # Limits
     max_file_size_mb: int = 500
     max_duration_seconds: int = 14400  # 4 hours
 
+    # Decoded audio kept in memory for re-uploaded files, keyed by content hash
+    audio_cache_bytes: int = 512 * 1024**2
+
+    # Result cache (keyed by upload content and transcription options)
+    enable_result_cache: bool = True
+    result_cache_size: int = 128
+
+    # Recently used job records kept in memory in front of the job database
+    job_cache_size: int = 256
+
     # Storage
     upload_dir: str = "/app/uploads"
     output_dir: str = "/app/outputs"
@@ -0,0 +1,115 @@
+"""SQLite-backed transcription job storage."""
+
+import functools
+import sqlite3
+import threading
+from pathlib import Path
+
+from src.config import settings
+from src.schemas import JobStatus, TranscriptionJob, TranscriptionResult
+
+
+class JobStore:
+    """Durable job records that survive restarts.
+
+    Status and creation time are kept as columns so listing is an index
+    scan rather than a sort. Results are stored in their own table so job
+    rows stay small and listing never touches them.
+    """
+
+    def __init__(self, db_path: str | Path) -> None:
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(
+            str(db_path),
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._lock = threading.Lock()
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # WAL keeps the database consistent on a crash without syncing every write
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "job_id TEXT PRIMARY KEY, status TEXT NOT NULL, "
+            "created_at TEXT NOT NULL, json TEXT NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at DESC)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_created ON jobs (created_at DESC)")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS job_results (job_id TEXT PRIMARY KEY, json TEXT NOT NULL)"
+        )
+
+    def get(self, job_id: str) -> TranscriptionJob | None:
+        """Get a job by ID, without its result."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT json FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return TranscriptionJob.model_validate_json(row[0]) if row else None
+
+    def list(self, status: JobStatus | None = None, limit: int = 100) -> list[TranscriptionJob]:
+        """List jobs newest first, optionally filtered by status."""
+        with self._lock:
+            if status:
+                rows = self._db.execute(
+                    "SELECT json FROM jobs WHERE status = ? ORDER BY created_at DESC LIMIT ?",
+                    (status.value, limit),
+                ).fetchall()
+            else:
+                rows = self._db.execute(
+                    "SELECT json FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+                ).fetchall()
+        return [TranscriptionJob.model_validate_json(job_json) for (job_json,) in rows]
+
+    def put(self, job: TranscriptionJob) -> None:
+        """Insert or replace a job record (its result is stored separately)."""
+        job_json = job.model_dump_json(exclude={"result"})
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO jobs (job_id, status, created_at, json) VALUES (?, ?, ?, ?)",
+                (job.job_id, job.status.value, job.created_at, job_json),
+            )
+
+    def get_result(self, job_id: str) -> TranscriptionResult | None:
+        """Get a job's result, or None if it has none."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT json FROM job_results WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return TranscriptionResult.model_validate_json(row[0]) if row else None
+
+    def put_result(self, job_id: str, result: TranscriptionResult) -> None:
+        """Store a job's result."""
+        result_json = result.model_dump_json()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO job_results (job_id, json) VALUES (?, ?)",
+                (job_id, result_json),
+            )
+
+    def delete(self, job_id: str) -> bool:
+        """Delete a job and its result. Returns False if it did not exist."""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                deleted = self._db.execute(
+                    "DELETE FROM jobs WHERE job_id = ?", (job_id,)
+                ).rowcount
+                self._db.execute("DELETE FROM job_results WHERE job_id = ?", (job_id,))
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        return deleted > 0
+
+
+@functools.lru_cache(maxsize=1)
+def get_job_store() -> JobStore:
+    """Get the process-wide job store, opening it on first use.
+
+    Opening creates the output directory and the database, so importing
+    this module has no filesystem side effects.
+    """
+    return JobStore(Path(settings.output_dir) / "jobs.db")
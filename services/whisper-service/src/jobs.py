@@ -1,19 +1,23 @@
 """Transcription job management."""
 
 import asyncio
+import hashlib
 import logging
 import uuid
+from collections import OrderedDict
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from src.config import settings
+from src.job_store import get_job_store
 from src.schemas import (
     JobStatus,
     ModelSize,
     TranscriptionJob,
     TranscriptionResult,
 )
-from src.transcriber import engine
+from src.transcriber import get_engine, get_engine_executor
 
 logger = logging.getLogger(__name__)
 
@@ -22,8 +26,10 @@ class JobManager:
     """Manages transcription jobs."""
 
     def __init__(self) -> None:
-        self._jobs: dict[str, TranscriptionJob] = {}
-        self._results: dict[str, TranscriptionResult] = {}
+        # Hot job records in front of the job store, least recent first
+        self._jobs: OrderedDict[str, TranscriptionJob] = OrderedDict()
+        # Results of past jobs by content + options hash, least recent first
+        self._result_cache: OrderedDict[str, TranscriptionResult] = OrderedDict()
         self._lock = asyncio.Lock()
 
     async def create_job(
@@ -47,18 +53,46 @@ class JobManager:
         )
 
         async with self._lock:
-            self._jobs[job_id] = job
+            await asyncio.to_thread(get_job_store().put, job)
+            self._cache_job(job)
 
         return job
 
+    def _cache_job(self, job: TranscriptionJob) -> None:
+        """Keep a job record in memory, evicting the least recently used."""
+        self._jobs[job.job_id] = job
+        self._jobs.move_to_end(job.job_id)
+        while len(self._jobs) > settings.job_cache_size:
+            self._jobs.popitem(last=False)
+
+    def _load_job(self, job_id: str) -> TranscriptionJob | None:
+        """Get a job record from memory, falling back to the job store.
+
+        The fallback is a single indexed row, read inline: awaiting it could
+        let a concurrent write land first and then be shadowed in memory by
+        the stale record read here.
+        """
+        job = self._jobs.get(job_id)
+        if job is not None:
+            self._jobs.move_to_end(job_id)
+            return job
+
+        job = get_job_store().get(job_id)
+        if job is not None:
+            self._cache_job(job)
+        return job
+
     async def get_job(self, job_id: str) -> TranscriptionJob | None:
         """Get a job by ID."""
-        async with self._lock:
-            job = self._jobs.get(job_id)
-            if job and job.status == JobStatus.COMPLETED:
-                # Attach result if completed
-                job.result = self._results.get(job_id)
-            return job
+        # Reads need no lock: loading the record does not await, so no write
+        # can interleave with it
+        job = self._load_job(job_id)
+        if job and job.status == JobStatus.COMPLETED:
+            # Attach result if completed; the cached record never holds one.
+            # Results are whole transcripts, so they are read off the loop
+            result = await asyncio.to_thread(get_job_store().get_result, job_id)
+            job = job.model_copy(update={"result": result})
+        return job
 
     async def list_jobs(
         self,
@@ -66,16 +100,8 @@ class JobManager:
         limit: int = 100,
     ) -> list[TranscriptionJob]:
         """List jobs, optionally filtered by status."""
-        async with self._lock:
-            jobs = list(self._jobs.values())
-
-        if status:
-            jobs = [j for j in jobs if j.status == status]
-
-        # Sort by created_at descending
-        jobs.sort(key=lambda j: j.created_at, reverse=True)
-
-        return jobs[:limit]
+        # Newest first, read straight off the (status, created_at) index
+        return await asyncio.to_thread(get_job_store().list, status=status, limit=limit)
 
     async def update_job(
         self,
@@ -87,13 +113,21 @@ class JobManager:
     ) -> TranscriptionJob | None:
         """Update a job's status."""
         async with self._lock:
-            job = self._jobs.get(job_id)
+            job = self._load_job(job_id)
             if not job:
                 return None
 
-            now = datetime.now(timezone.utc).isoformat()
+            # Serializing and writing a word-timestamped transcript (or a WAL
+            # checkpoint) takes far too long to block the event loop. Store it
+            # before the cached record turns COMPLETED, so lock-free readers
+            # never see a completed job without its result
+            if result:
+                await asyncio.to_thread(get_job_store().put_result, job_id, result)
 
-            if status:
+            # Timestamps only change on status transitions, so progress-only
+            # updates skip the clock entirely
+            if status and status != job.status:
+                now = datetime.now(timezone.utc).isoformat()
                 job.status = status
                 if status == JobStatus.PROCESSING and not job.started_at:
                     job.started_at = now
@@ -106,20 +140,17 @@ class JobManager:
             if error:
                 job.error = error
 
-            if result:
-                self._results[job_id] = result
-                job.result = result
+            await asyncio.to_thread(get_job_store().put, job)
 
+            if result:
+                return job.model_copy(update={"result": result})
             return job
 
     async def delete_job(self, job_id: str) -> bool:
         """Delete a job."""
         async with self._lock:
-            if job_id in self._jobs:
-                del self._jobs[job_id]
-                self._results.pop(job_id, None)
-                return True
-            return False
+            self._jobs.pop(job_id, None)
+            return await asyncio.to_thread(get_job_store().delete, job_id)
 
     async def process_job(
         self,
@@ -129,22 +160,54 @@ class JobManager:
         language: str | None = None,
         word_timestamps: bool = True,
         batch_size: int = 16,
-        beam_size: int = 5,
+        beam_size: int | None = None,
         initial_prompt: str | None = None,
         vad_filter: bool = True,
         vad_parameters: dict[str, Any] | None = None,
+        vad_segments: list[tuple[float, float]] | None = None,
+        content_hash: str | None = None,
     ) -> TranscriptionResult | None:
-        """Process a transcription job."""
+        """Process a transcription job.
+
+        When content_hash (a digest of the uploaded file) is given, an
+        identical earlier job's result is reused instead of transcribing.
+        """
+        cache_key = None
+        if settings.enable_result_cache and content_hash:
+            options = (
+                model.value,
+                language,
+                word_timestamps,
+                beam_size,
+                initial_prompt,
+                vad_filter,
+                sorted((vad_parameters or {}).items()),
+                vad_segments,
+            )
+            cache_key = hashlib.sha256(f"{content_hash}:{options!r}".encode()).hexdigest()
+
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                self._result_cache.move_to_end(cache_key)
+                logger.info(f"Result cache hit for job {job_id}")
+                await self.update_job(
+                    job_id,
+                    status=JobStatus.COMPLETED,
+                    progress=1.0,
+                    result=cached,
+                )
+                return cached
+
         # Update status to processing
         await self.update_job(job_id, status=JobStatus.PROCESSING, progress=0.1)
 
         try:
             # Run transcription in thread pool to not block
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             result = await loop.run_in_executor(
-                None,
-                lambda: engine.transcribe(
-                    audio_path=audio_path,
+                get_engine_executor(),
+                lambda: get_engine().transcribe(
+                    audio=audio_path,
                     model_id=model,
                     language=language,
                     word_timestamps=word_timestamps,
@@ -153,9 +216,16 @@ class JobManager:
                     initial_prompt=initial_prompt,
                     vad_filter=vad_filter,
                     vad_parameters=vad_parameters,
+                    vad_segments=vad_segments,
+                    content_hash=content_hash,
                 ),
             )
 
+            if cache_key is not None:
+                self._result_cache[cache_key] = result
+                while len(self._result_cache) > settings.result_cache_size:
+                    self._result_cache.popitem(last=False)
+
             # Update with result
             await self.update_job(
                 job_id,
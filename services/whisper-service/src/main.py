@@ -1,5 +1,6 @@
 """WhisperX transcription service."""
 
+import hashlib
 import logging
 import os
 import uuid
@@ -8,8 +9,10 @@ from pathlib import Path
 from typing import Any
 
 import aiofiles
+import orjson
 from fastapi import BackgroundTasks, FastAPI, File, Form, HTTPException, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
 from src.config import settings
 from src.jobs import job_manager
@@ -23,7 +26,7 @@ from src.schemas import (
     TranscriptionRequest,
     TranscriptionResult,
 )
-from src.transcriber import engine
+from src.transcriber import get_engine, get_engine_executor
 
 # Configure logging
 logging.basicConfig(
@@ -32,18 +35,65 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+
+async def _save_upload(file: UploadFile, upload_path: Path) -> str:
+    """Stream an upload to disk in chunks, enforcing the size limit as it arrives.
+
+    Returns the SHA-256 of the uploaded bytes.
+    """
+    max_size = settings.max_file_size_mb * 1024 * 1024
+    file_size = 0
+    digest = hashlib.sha256()
+
+    async with aiofiles.open(upload_path, "wb") as f:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            file_size += len(chunk)
+            if file_size > max_size:
+                break
+            digest.update(chunk)
+            await f.write(chunk)
+
+    if file_size > max_size:
+        upload_path.unlink()
+        raise HTTPException(
+            status_code=413,
+            detail=f"File too large. Maximum size is {settings.max_file_size_mb}MB",
+        )
+
+    return digest.hexdigest()
+
+
+def _parse_vad_segments(raw: str | None) -> list[tuple[float, float]] | None:
+    """Parse a JSON list of [start, end] speech spans in seconds."""
+    if not raw:
+        return None
+    try:
+        spans = [(float(start), float(end)) for start, end in orjson.loads(raw)]
+    except (orjson.JSONDecodeError, TypeError, ValueError) as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"vad_segments must be a JSON list of [start, end] pairs: {e}",
+        ) from e
+    if any(end <= start or start < 0 for start, end in spans):
+        raise HTTPException(status_code=400, detail="vad_segments spans must have 0 <= start < end")
+    return spans
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     # Startup
     logger.info(f"Starting {settings.service_name}")
+    engine = get_engine()
     logger.info(f"Device: {engine.device}, Compute type: {engine.compute_type}")
 
-    # Optionally preload default model
+    # Optionally preload and warm up the default model
     if os.environ.get("PRELOAD_MODEL", "").lower() == "true":
         try:
             engine.load_model(ModelSize(settings.default_model))
+            engine.warmup(ModelSize(settings.default_model))
         except Exception as e:
             logger.warning(f"Failed to preload model: {e}")
 
@@ -58,6 +108,9 @@ app = FastAPI(
     description="WhisperX-based audio transcription service for Verbatim Studio",
     version="0.1.0",
     lifespan=lifespan,
+    # Transcripts carry a timestamp per word; orjson encodes them far faster
+    # than the stdlib encoder
+    default_response_class=ORJSONResponse,
 )
 
 # CORS
@@ -74,6 +127,7 @@ app.add_middleware(
 @app.get("/health", response_model=HealthResponse, tags=["System"])
 async def health_check() -> HealthResponse:
     """Check service health."""
+    engine = get_engine()
     models_loaded = [m.value for m in engine._models.keys()]
     return HealthResponse(
         status="healthy",
@@ -87,20 +141,20 @@ async def health_check() -> HealthResponse:
 @app.get("/models", response_model=list[ModelInfo], tags=["Models"])
 async def list_models() -> list[ModelInfo]:
     """List all available Whisper models."""
-    return engine.list_models()
+    return get_engine().list_models()
 
 
 @app.get("/models/{model_id}", response_model=ModelInfo, tags=["Models"])
 async def get_model(model_id: ModelSize) -> ModelInfo:
     """Get information about a specific model."""
-    return engine.get_model_info(model_id)
+    return get_engine().get_model_info(model_id)
 
 
 @app.post("/models/{model_id}/load", response_model=ModelInfo, tags=["Models"])
 async def load_model(model_id: ModelSize) -> ModelInfo:
     """Load a model into memory."""
     try:
-        return engine.load_model(model_id)
+        return get_engine().load_model(model_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -108,7 +162,7 @@ async def load_model(model_id: ModelSize) -> ModelInfo:
 @app.post("/models/{model_id}/unload", tags=["Models"])
 async def unload_model(model_id: ModelSize) -> dict[str, bool]:
     """Unload a model from memory."""
-    success = engine.unload_model(model_id)
+    success = get_engine().unload_model(model_id)
     return {"success": success}
 
 
@@ -121,9 +175,10 @@ async def transcribe(
     language: str | None = Form(default=None),
     word_timestamps: bool = Form(default=True),
     batch_size: int = Form(default=16),
-    beam_size: int = Form(default=5),
+    beam_size: int | None = Form(default=None),
     initial_prompt: str | None = Form(default=None),
     vad_filter: bool = Form(default=True),
+    vad_segments: str | None = Form(default=None),
 ) -> TranscriptionJob:
     """
     Transcribe an audio or video file.
@@ -133,27 +188,14 @@ async def transcribe(
     """
     if not file.filename:
         raise HTTPException(status_code=400, detail="No filename provided")
-
-    # Validate file size
-    file.file.seek(0, 2)
-    file_size = file.file.tell()
-    file.file.seek(0)
-
-    max_size = settings.max_file_size_mb * 1024 * 1024
-    if file_size > max_size:
-        raise HTTPException(
-            status_code=413,
-            detail=f"File too large. Maximum size is {settings.max_file_size_mb}MB",
-        )
+    speech_spans = _parse_vad_segments(vad_segments)
 
     # Save uploaded file
     file_id = str(uuid.uuid4())
     file_ext = Path(file.filename).suffix
     upload_path = Path(settings.upload_dir) / f"{file_id}{file_ext}"
 
-    async with aiofiles.open(upload_path, "wb") as f:
-        content = await file.read()
-        await f.write(content)
+    content_hash = await _save_upload(file, upload_path)
 
     # Create job
     job = await job_manager.create_job(
@@ -174,6 +216,8 @@ async def transcribe(
         beam_size=beam_size,
         initial_prompt=initial_prompt,
         vad_filter=vad_filter,
+        vad_segments=speech_spans,
+        content_hash=content_hash,
     )
 
     return job
@@ -186,9 +230,10 @@ async def transcribe_sync(
     language: str | None = Form(default=None),
     word_timestamps: bool = Form(default=True),
     batch_size: int = Form(default=16),
-    beam_size: int = Form(default=5),
+    beam_size: int | None = Form(default=None),
     initial_prompt: str | None = Form(default=None),
     vad_filter: bool = Form(default=True),
+    vad_segments: str | None = Form(default=None),
 ) -> TranscriptionResult:
     """
     Transcribe an audio file synchronously.
@@ -198,25 +243,25 @@ async def transcribe_sync(
     """
     if not file.filename:
         raise HTTPException(status_code=400, detail="No filename provided")
+    speech_spans = _parse_vad_segments(vad_segments)
 
     # Save uploaded file
     file_id = str(uuid.uuid4())
     file_ext = Path(file.filename).suffix
     upload_path = Path(settings.upload_dir) / f"{file_id}{file_ext}"
 
-    async with aiofiles.open(upload_path, "wb") as f:
-        content = await file.read()
-        await f.write(content)
+    content_hash = await _save_upload(file, upload_path)
 
     try:
         # Run transcription
         import asyncio
 
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         result = await loop.run_in_executor(
-            None,
-            lambda: engine.transcribe(
-                audio_path=upload_path,
+            get_engine_executor(),
+            lambda: get_engine().transcribe(
+                audio=upload_path,
+                content_hash=content_hash,
                 model_id=model,
                 language=language,
                 word_timestamps=word_timestamps,
@@ -224,6 +269,7 @@ async def transcribe_sync(
                 beam_size=beam_size,
                 initial_prompt=initial_prompt,
                 vad_filter=vad_filter,
+                vad_segments=speech_spans,
             ),
         )
         return result
@@ -237,6 +283,132 @@ async def transcribe_sync(
             upload_path.unlink()
 
 
+@app.post("/transcribe/stream", tags=["Transcription"])
+async def transcribe_stream(
+    file: UploadFile = File(...),
+    model: ModelSize = Form(default=ModelSize.SMALL),
+    language: str | None = Form(default=None),
+    word_timestamps: bool = Form(default=True),
+    batch_size: int = Form(default=16),
+    beam_size: int | None = Form(default=None),
+    initial_prompt: str | None = Form(default=None),
+    vad_filter: bool = Form(default=True),
+    vad_segments: str | None = Form(default=None),
+) -> StreamingResponse:
+    """
+    Transcribe an audio file, streaming segments as NDJSON as they are decoded.
+
+    The first line holds the language and its probability; every following
+    line is one transcript segment.
+    """
+    if not file.filename:
+        raise HTTPException(status_code=400, detail="No filename provided")
+    speech_spans = _parse_vad_segments(vad_segments)
+
+    # Save uploaded file
+    file_id = str(uuid.uuid4())
+    file_ext = Path(file.filename).suffix
+    upload_path = Path(settings.upload_dir) / f"{file_id}{file_ext}"
+
+    content_hash = await _save_upload(file, upload_path)
+
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    try:
+        segments, info = await loop.run_in_executor(
+            get_engine_executor(),
+            lambda: get_engine().transcribe_stream(
+                audio=upload_path,
+                content_hash=content_hash,
+                model_id=model,
+                language=language,
+                word_timestamps=word_timestamps,
+                batch_size=batch_size,
+                beam_size=beam_size,
+                initial_prompt=initial_prompt,
+                vad_filter=vad_filter,
+                vad_segments=speech_spans,
+            ),
+        )
+    except Exception as e:
+        upload_path.unlink(missing_ok=True)
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+    async def lines():
+        try:
+            yield orjson.dumps(
+                {"language": info.language, "language_probability": info.language_probability}
+            ) + b"\n"
+            # Decode one segment at a time on the engine's executor
+            while (segment := await loop.run_in_executor(
+                get_engine_executor(), next, segments, None
+            )) is not None:
+                yield segment.model_dump_json().encode() + b"\n"
+        finally:
+            # Clean up uploaded file
+            upload_path.unlink(missing_ok=True)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@app.post("/transcribe/batch", response_model=list[TranscriptionResult], tags=["Transcription"])
+async def transcribe_batch(
+    files: list[UploadFile] = File(...),
+    model: ModelSize = Form(default=ModelSize.SMALL),
+    language: str | None = Form(default=None),
+    word_timestamps: bool = Form(default=True),
+    batch_size: int = Form(default=16),
+    beam_size: int | None = Form(default=None),
+    initial_prompt: str | None = Form(default=None),
+    vad_filter: bool = Form(default=True),
+) -> list[TranscriptionResult]:
+    """
+    Transcribe several audio files synchronously in one batched pass.
+
+    Returns one result per file, in upload order. Like /transcribe/sync,
+    this blocks until every file is transcribed.
+    """
+    if any(not file.filename for file in files):
+        raise HTTPException(status_code=400, detail="No filename provided")
+
+    upload_paths: list[Path] = []
+    content_hashes: list[str] = []
+    try:
+        # Save uploaded files
+        for file in files:
+            upload_path = Path(settings.upload_dir) / f"{uuid.uuid4()}{Path(file.filename).suffix}"
+            content_hashes.append(await _save_upload(file, upload_path))
+            upload_paths.append(upload_path)
+
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                get_engine_executor(),
+                lambda: get_engine().transcribe_batch(
+                    audio_paths=upload_paths,
+                    content_hashes=content_hashes,
+                    model_id=model,
+                    language=language,
+                    word_timestamps=word_timestamps,
+                    batch_size=batch_size,
+                    beam_size=beam_size,
+                    initial_prompt=initial_prompt,
+                    vad_filter=vad_filter,
+                ),
+            )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e)) from e
+
+    finally:
+        # Clean up uploaded files
+        for upload_path in upload_paths:
+            if upload_path.exists():
+                upload_path.unlink()
+
+
 # Job management
 @app.get("/jobs", response_model=list[TranscriptionJob], tags=["Jobs"])
 async def list_jobs(
@@ -71,10 +71,11 @@ class TranscriptionRequest(BaseModel):
     language: str | None = None  # None = auto-detect
     word_timestamps: bool = True
     batch_size: int = 16
-    beam_size: int = 5
+    beam_size: int | None = None  # None = 5 on CUDA, 1 on CPU
     initial_prompt: str | None = None
     vad_filter: bool = True
     vad_parameters: dict[str, Any] | None = None
+    vad_segments: list[tuple[float, float]] | None = None  # Upstream speech spans (s)
 
 
 class TranscriptionJob(BaseModel):
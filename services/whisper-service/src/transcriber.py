@@ -1,10 +1,21 @@
 """Faster-Whisper transcription engine."""
 
+import functools
+import gc
 import logging
 import os
+import queue
+import threading
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any
 
+import numpy as np
+from cpu_tuning import cpu_compute_type, physical_cores
+
+from src.audio_cache import SAMPLE_RATE, get_audio
 from src.config import settings
 from src.schemas import (
     ModelInfo,
@@ -16,6 +27,8 @@ from src.schemas import (
 
 logger = logging.getLogger(__name__)
 
+CHUNK_SAMPLES = 30 * SAMPLE_RATE  # Whisper's fixed input window
+
 
 # Model metadata
 MODEL_INFO: dict[ModelSize, dict[str, Any]] = {
@@ -27,31 +40,97 @@ MODEL_INFO: dict[ModelSize, dict[str, Any]] = {
 }
 
 
+# Transcriptions currently holding the cyclic GC off
+_gc_pauses = 0
+_gc_lock = threading.Lock()
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """Hold off the cyclic garbage collector while converting decoded segments.
+
+    Segment and word objects form no reference cycles, but allocating tens
+    of thousands of them triggers repeated collections that rescan the
+    growing transcript. Only wrap the conversion, never decoding: the GC is
+    process-wide and resumes only once every overlapping pause has ended.
+    """
+    global _gc_pauses
+
+    with _gc_lock:
+        _gc_pauses += 1
+        gc.disable()
+    try:
+        yield
+    finally:
+        with _gc_lock:
+            _gc_pauses -= 1
+            if _gc_pauses == 0:
+                gc.enable()
+
+
+def _prefetch(items: Iterable, maxsize: int = 8) -> Iterator:
+    """Iterate over items produced on a background thread, up to maxsize ahead.
+
+    faster-whisper decodes each segment as it is requested, with the GIL
+    released inside CTranslate2; pulling from a separate thread lets decoding
+    continue while the consumer converts the previous segments.
+    """
+    buffer: queue.Queue = queue.Queue(maxsize)
+    stop = threading.Event()
+
+    def put(entry: tuple[str, Any]) -> bool:
+        # Give up once the consumer has gone away
+        while not stop.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for item in items:
+                if not put(("item", item)):
+                    return
+            put(("done", None))
+        except Exception as e:
+            put(("error", e))
+
+    threading.Thread(target=produce, name="whisper-prefetch", daemon=True).start()
+    try:
+        while True:
+            kind, value = buffer.get()
+            if kind == "done":
+                return
+            if kind == "error":
+                raise value
+            yield value
+    finally:
+        stop.set()
+
+
 class TranscriptionEngine:
     """Faster-Whisper based transcription engine."""
 
     def __init__(self) -> None:
         self._models: dict[ModelSize, Any] = {}
+        # BatchedInferencePipeline wrappers around loaded models
+        self._batched_models: dict[ModelSize, Any] = {}
         self._device: str = self._detect_device()
         self._compute_type: str = self._get_compute_type()
 
-        # Ensure directories exist
-        os.makedirs(settings.model_cache_dir, exist_ok=True)
-        os.makedirs(settings.upload_dir, exist_ok=True)
-        os.makedirs(settings.output_dir, exist_ok=True)
-
     def _detect_device(self) -> str:
         """Detect the best available compute device."""
         if settings.device != "auto":
             return settings.device
 
-        try:
-            import torch
-            if torch.cuda.is_available():
-                logger.info("CUDA available, using GPU")
-                return "cuda"
-        except ImportError:
-            pass
+        # Ask CTranslate2, which runs the models, rather than importing torch
+        import ctranslate2
+
+        if ctranslate2.get_cuda_device_count() > 0:
+            logger.info("CUDA available, using GPU")
+            return "cuda"
 
         logger.info("Using CPU")
         return "cpu"
@@ -62,9 +141,38 @@ class TranscriptionEngine:
             return settings.compute_type
 
         if self._device == "cuda":
+            # int8 weights with fp16 activations halve weight bandwidth for the
+            # memory-bound decoder; CTranslate2 quantizes the fp16 weights at load
+            if settings.weight_only_int8:
+                import ctranslate2
+
+                if "int8_float16" in ctranslate2.get_supported_compute_types("cuda"):
+                    return "int8_float16"
             return "float16"
         else:
-            return "int8"  # CPU optimization
+            return cpu_compute_type()
+
+    def _get_parallelism(self) -> tuple[int, int]:
+        """Get the (num_workers, cpu_threads) to load models with.
+
+        Each worker is an independent decoding context, so concurrent
+        transcriptions overlap instead of queueing on a single model.
+        """
+        num_workers = settings.num_workers or (2 if self._device == "cuda" else 1)
+        cpu_threads = settings.cpu_threads
+        if not cpu_threads and self._device == "cpu":
+            cpu_threads = physical_cores()
+        return num_workers, cpu_threads
+
+    def _resolve_beam_size(self, beam_size: int | None) -> int:
+        """Get the beam size to decode with when the caller did not choose one.
+
+        Beam search is nearly free on a GPU, but on CPU the decoder cost grows
+        with the beam, so CPU decoding defaults to greedy.
+        """
+        if beam_size:
+            return beam_size
+        return settings.default_beam_size if self._device == "cuda" else 1
 
     @property
     def device(self) -> str:
@@ -103,11 +211,14 @@ class TranscriptionEngine:
         try:
             from faster_whisper import WhisperModel
 
+            num_workers, cpu_threads = self._get_parallelism()
             model = WhisperModel(
                 model_id.value,
                 device=self._device,
                 compute_type=self._compute_type,
                 download_root=settings.model_cache_dir,
+                num_workers=num_workers,
+                cpu_threads=cpu_threads,
             )
             self._models[model_id] = model
             logger.info(f"Model {model_id.value} loaded successfully")
@@ -117,38 +228,149 @@ class TranscriptionEngine:
             logger.error(f"Failed to load model {model_id.value}: {e}")
             raise RuntimeError(f"Failed to load model: {e}") from e
 
+    def warmup(self, model_id: ModelSize) -> None:
+        """Run a loaded model once on silence.
+
+        The first transcription pays for CUDA kernel selection and CTranslate2
+        buffer allocation; doing it here keeps that off the first request.
+        """
+        model = self._models[model_id]
+        silence = np.zeros(16000, dtype=np.float32)  # 1 s at Whisper's 16 kHz
+        segments, _ = model.transcribe(silence, beam_size=1, vad_filter=False)
+        # Segments are generated lazily; consume them to actually decode
+        for _ in segments:
+            pass
+        logger.info(f"Model {model_id.value} warmed up")
+
     def unload_model(self, model_id: ModelSize) -> bool:
         """Unload a model from memory."""
         if model_id not in self._models:
             return False
 
         del self._models[model_id]
+        self._batched_models.pop(model_id, None)
         logger.info(f"Model {model_id.value} unloaded")
         return True
 
     def transcribe(
         self,
-        audio_path: str | Path,
+        audio: str | Path | np.ndarray,
         model_id: ModelSize = ModelSize.SMALL,
         language: str | None = None,
         word_timestamps: bool = True,
         batch_size: int = 16,
-        beam_size: int = 5,
+        beam_size: int | None = None,
         initial_prompt: str | None = None,
         vad_filter: bool = True,
         vad_parameters: dict[str, Any] | None = None,
+        vad_segments: list[tuple[float, float]] | None = None,
+        content_hash: str | None = None,
     ) -> TranscriptionResult:
-        """Transcribe an audio file."""
-        audio_path = Path(audio_path)
-        if not audio_path.exists():
-            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+        """Transcribe an audio file, or mono 16 kHz float32 samples."""
+        segments_generator, info = self._decode(
+            audio,
+            model_id=model_id,
+            language=language,
+            word_timestamps=word_timestamps,
+            batch_size=batch_size,
+            beam_size=beam_size,
+            initial_prompt=initial_prompt,
+            vad_filter=vad_filter,
+            vad_parameters=vad_parameters,
+            vad_segments=vad_segments,
+            content_hash=content_hash,
+        )
+        # Decode first; the GC is only held off for the quick conversion
+        raw_segments = list(segments_generator)
+        with _gc_paused():
+            segments = [
+                self._to_segment(i, seg, word_timestamps)
+                for i, seg in enumerate(raw_segments)
+            ]
+        return self._to_result(segments, info.language, info.language_probability)
+
+    def transcribe_stream(
+        self,
+        audio: str | Path | np.ndarray,
+        model_id: ModelSize = ModelSize.SMALL,
+        language: str | None = None,
+        word_timestamps: bool = True,
+        batch_size: int = 16,
+        beam_size: int | None = None,
+        initial_prompt: str | None = None,
+        vad_filter: bool = True,
+        vad_parameters: dict[str, Any] | None = None,
+        vad_segments: list[tuple[float, float]] | None = None,
+        content_hash: str | None = None,
+    ) -> tuple[Iterator[TranscriptSegment], Any]:
+        """Transcribe audio, producing segments as they are decoded.
+
+        audio is a file path or mono 16 kHz float32 samples.
+
+        Returns the segments iterator and faster-whisper's TranscriptionInfo
+        (language, duration, ...), which is known before decoding starts.
+        Decoding happens as the iterator is consumed.
+
+        vad_segments are (start, end) speech spans in seconds from an upstream
+        VAD; when given, only those spans are decoded and the built-in VAD is
+        skipped instead of running a second time. content_hash, the SHA-256 of
+        the file's bytes, lets a re-uploaded file reuse its decoded audio.
+        """
+        segments_generator, info = self._decode(
+            audio,
+            model_id=model_id,
+            language=language,
+            word_timestamps=word_timestamps,
+            batch_size=batch_size,
+            beam_size=beam_size,
+            initial_prompt=initial_prompt,
+            vad_filter=vad_filter,
+            vad_parameters=vad_parameters,
+            vad_segments=vad_segments,
+            content_hash=content_hash,
+        )
+        segments_iter = (
+            self._to_segment(i, seg, word_timestamps)
+            for i, seg in enumerate(_prefetch(segments_generator))
+        )
+        return segments_iter, info
+
+    def _decode(
+        self,
+        audio: str | Path | np.ndarray,
+        model_id: ModelSize = ModelSize.SMALL,
+        language: str | None = None,
+        word_timestamps: bool = True,
+        batch_size: int = 16,
+        beam_size: int | None = None,
+        initial_prompt: str | None = None,
+        vad_filter: bool = True,
+        vad_parameters: dict[str, Any] | None = None,
+        vad_segments: list[tuple[float, float]] | None = None,
+        content_hash: str | None = None,
+    ) -> tuple[Iterator[Any], Any]:
+        """Start faster-whisper on audio, returning its lazy segments and info."""
+        if isinstance(audio, np.ndarray):
+            # Samples from the caller are used as is, skipping ffmpeg entirely
+            if audio.dtype != np.float32 or audio.ndim != 1:
+                raise ValueError("Audio samples must be mono 16 kHz float32")
+            name = "in-memory audio"
+        else:
+            audio_path = Path(audio)
+            if not audio_path.exists():
+                raise FileNotFoundError(f"Audio file not found: {audio_path}")
+            audio = get_audio(audio_path, content_hash)
+            name = audio_path.name
 
         # Ensure model is loaded
         if model_id not in self._models:
             self.load_model(model_id)
 
         model = self._models[model_id]
-        logger.info(f"Transcribing {audio_path.name} with model {model_id.value}")
+        beam_size = self._resolve_beam_size(beam_size)
+        logger.info(
+            f"Transcribing {name} with model {model_id.value}, beam size {beam_size}"
+        )
 
         # Transcribe with faster-whisper
         transcribe_options: dict[str, Any] = {
@@ -162,48 +384,234 @@ class TranscriptionEngine:
             transcribe_options["initial_prompt"] = initial_prompt
         if vad_parameters:
             transcribe_options["vad_parameters"] = vad_parameters
+        if vad_segments:
+            transcribe_options["vad_filter"] = False
+            transcribe_options["clip_timestamps"] = [
+                t for start, end in vad_segments for t in (start, end)
+            ]
+
+        return model.transcribe(audio, **transcribe_options)
 
-        segments_generator, info = model.transcribe(str(audio_path), **transcribe_options)
-
-        # Convert generator to list and build result
-        segments = []
-        full_text_parts = []
-
-        for i, seg in enumerate(segments_generator):
-            words = []
-            if word_timestamps and seg.words:
-                for w in seg.words:
-                    words.append(
-                        WordTimestamp(
-                            word=w.word,
-                            start=w.start,
-                            end=w.end,
-                            confidence=w.probability,
+    def transcribe_batch(
+        self,
+        audio_paths: list[str | Path],
+        model_id: ModelSize = ModelSize.SMALL,
+        language: str | None = None,
+        word_timestamps: bool = True,
+        batch_size: int = 16,
+        beam_size: int | None = None,
+        initial_prompt: str | None = None,
+        vad_filter: bool = True,
+        vad_parameters: dict[str, Any] | None = None,
+        content_hashes: list[str] | None = None,
+    ) -> list[TranscriptionResult]:
+        """Transcribe several audio files together.
+
+        Each file is cut into speech chunks of up to 30 s and the chunks of
+        every file are decoded together by faster-whisper's batched pipeline,
+        so the encoder and beam search run over full batches instead of one
+        file at a time. content_hashes, one per path, let re-uploaded files
+        reuse their decoded audio. Returns one result per path, in order.
+        """
+        from faster_whisper import BatchedInferencePipeline
+
+        audio_paths = [Path(path) for path in audio_paths]
+        for audio_path in audio_paths:
+            if not audio_path.exists():
+                raise FileNotFoundError(f"Audio file not found: {audio_path}")
+
+        # Ensure model is loaded
+        if model_id not in self._models:
+            self.load_model(model_id)
+
+        model = self._models[model_id]
+        pipeline = self._batched_models.get(model_id)
+        if pipeline is None:
+            pipeline = BatchedInferencePipeline(model=model)
+            self._batched_models[model_id] = pipeline
+
+        beam_size = self._resolve_beam_size(beam_size)
+        logger.info(
+            f"Transcribing {len(audio_paths)} files with model {model_id.value}, "
+            f"beam size {beam_size}"
+        )
+
+        # Decoding is mostly ffmpeg work, so files decode in parallel
+        with ThreadPoolExecutor(max_workers=min(len(audio_paths), 4) or 1) as pool:
+            audios = list(
+                pool.map(get_audio, audio_paths, content_hashes or [None] * len(audio_paths))
+            )
+
+        # A pipeline call decodes in a single language, so group files by it
+        groups: dict[str, list[int]] = {}
+        probabilities = [1.0] * len(audios)
+        for index, audio in enumerate(audios):
+            file_language = language
+            if not file_language:
+                file_language, probabilities[index], _ = model.detect_language(audio)
+            groups.setdefault(file_language, []).append(index)
+
+        results: list[TranscriptionResult | None] = [None] * len(audios)
+        for group_language, indices in groups.items():
+            clips = [audios[index] for index in indices]
+            offsets = np.cumsum([0] + [len(clip) for clip in clips])
+
+            # Lay the files end to end; each chunk stays inside one file
+            clip_timestamps = [
+                {"start": int(start + offset), "end": int(end + offset)}
+                for clip, offset in zip(clips, offsets[:-1], strict=True)
+                for start, end in self._speech_chunks(clip, vad_filter, vad_parameters)
+            ]
+            if not clip_timestamps:
+                # No speech in any of these files
+                for index in indices:
+                    results[index] = self._to_result([], group_language, probabilities[index])
+                continue
+
+            segments_generator, _ = pipeline.transcribe(
+                np.concatenate(clips),
+                language=group_language,
+                beam_size=beam_size,
+                word_timestamps=word_timestamps,
+                initial_prompt=initial_prompt,
+                vad_filter=False,  # Chunks are already cut at speech
+                clip_timestamps=clip_timestamps,
+                batch_size=batch_size,
+            )
+
+            # Decode first; the GC is only held off for the quick conversion
+            raw_segments = list(segments_generator)
+
+            # Assign each segment to the file it starts in
+            clip_ends = offsets[1:] / SAMPLE_RATE
+            clip_segments: list[list[TranscriptSegment]] = [[] for _ in clips]
+            with _gc_paused():
+                for seg in raw_segments:
+                    clip = min(
+                        int(np.searchsorted(clip_ends, seg.start, side="right")), len(clips) - 1
+                    )
+                    segments = clip_segments[clip]
+                    segments.append(
+                        self._to_segment(
+                            len(segments), seg, word_timestamps, float(offsets[clip]) / SAMPLE_RATE
                         )
                     )
 
-            segment = TranscriptSegment(
-                id=i,
-                start=seg.start,
-                end=seg.end,
-                text=seg.text.strip(),
-                confidence=seg.avg_logprob if hasattr(seg, 'avg_logprob') else 1.0,
-                words=words,
-            )
-            segments.append(segment)
-            full_text_parts.append(segment.text)
+            for index, segments in zip(indices, clip_segments, strict=True):
+                results[index] = self._to_result(segments, group_language, probabilities[index])
+
+        return results
+
+    def _speech_chunks(
+        self,
+        audio: np.ndarray,
+        vad_filter: bool,
+        vad_parameters: dict[str, Any] | None,
+    ) -> list[tuple[int, int]]:
+        """Split audio into (start, end) sample ranges of at most 30 s.
+
+        With vad_filter, ranges cover detected speech and consecutive speech
+        is packed together up to the window size; otherwise the audio is cut
+        into consecutive 30 s windows.
+        """
+        if not vad_filter:
+            return [
+                (start, min(start + CHUNK_SAMPLES, len(audio)))
+                for start in range(0, len(audio), CHUNK_SAMPLES)
+            ]
+
+        from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+        # Speech longer than a window is split so every chunk fits
+        options = VadOptions(**{"max_speech_duration_s": 30, **(vad_parameters or {})})
+
+        chunks: list[tuple[int, int]] = []
+        for speech in get_speech_timestamps(audio, options):
+            start, end = speech["start"], speech["end"]
+            if chunks and end - chunks[-1][0] <= CHUNK_SAMPLES:
+                chunks[-1] = (chunks[-1][0], end)
+            else:
+                chunks.append((start, end))
+        return chunks
+
+    def _to_segment(
+        self,
+        index: int,
+        seg: Any,
+        word_timestamps: bool,
+        offset: float = 0.0,
+    ) -> TranscriptSegment:
+        """Convert a faster-whisper segment, shifting its times back by offset seconds.
+
+        Built with model_construct: the decoder's values are already typed, and
+        validating every word of a long transcript is a measurable cost.
+        """
+        words = []
+        if word_timestamps and seg.words:
+            # A comprehension over a local constructor avoids per-word
+            # attribute lookups and list.append calls
+            word_ctor = WordTimestamp.model_construct
+            words = [
+                word_ctor(
+                    word=w.word,
+                    start=w.start - offset,
+                    end=w.end - offset,
+                    confidence=w.probability,
+                )
+                for w in seg.words
+            ]
+
+        return TranscriptSegment.model_construct(
+            id=index,
+            start=seg.start - offset,
+            end=seg.end - offset,
+            text=seg.text.strip(),
+            confidence=seg.avg_logprob,
+            words=words,
+        )
 
+    def _to_result(
+        self,
+        segments: list[TranscriptSegment],
+        language: str,
+        language_probability: float,
+    ) -> TranscriptionResult:
+        """Build a transcription result from converted segments."""
         # Calculate duration
         duration = segments[-1].end if segments else 0.0
 
         return TranscriptionResult(
-            language=info.language,
-            language_probability=info.language_probability,
+            language=language,
+            language_probability=language_probability,
             duration=duration,
             segments=segments,
-            text=" ".join(full_text_parts),
+            text=" ".join(segment.text for segment in segments),
         )
 
 
-# Global engine instance
-engine = TranscriptionEngine()
+@functools.lru_cache(maxsize=1)
+def get_engine() -> TranscriptionEngine:
+    """Get the process-wide engine, creating it on first use.
+
+    Creating it probes CTranslate2 for CUDA devices, so importing this module stays cheap and
+    each forked worker only pays for that when it first needs the engine.
+    """
+    # Ensure directories exist
+    os.makedirs(settings.model_cache_dir, exist_ok=True)
+    os.makedirs(settings.upload_dir, exist_ok=True)
+    os.makedirs(settings.output_dir, exist_ok=True)
+
+    return TranscriptionEngine()
+
+
+@functools.lru_cache(maxsize=1)
+def get_engine_executor() -> ThreadPoolExecutor:
+    """Get the executor for model work, creating it on first use.
+
+    It has one thread per decoding context: callers queue here instead of
+    oversubscribing the device from the default pool's many threads.
+    """
+    return ThreadPoolExecutor(
+        max_workers=get_engine()._get_parallelism()[0],
+        thread_name_prefix="whisper",
+    )